@@ -0,0 +1,231 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import httpx
+
+from http_cache import http_cache
+from json_backend import loads_json
+from output_sinks import open_sink, JSON_LINES_FORMATS
+
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "4"))
+FETCH_MAX_RETRIES = int(os.getenv("FETCH_MAX_RETRIES", "3"))
+FETCH_RETRY_BACKOFF = float(os.getenv("FETCH_RETRY_BACKOFF", "0.5"))
+# Longest Retry-After honoured, so a server cannot park a worker thread for hours
+FETCH_MAX_RETRY_AFTER = float(os.getenv("FETCH_MAX_RETRY_AFTER", "30"))
+# Retrying POST/PUT/PATCH/DELETE after a timeout or 5xx can repeat side effects
+FETCH_RETRY_UNSAFE_METHODS = os.getenv("FETCH_RETRY_UNSAFE_METHODS", "false").lower() == "true"
+# Page limit when the request sets none, so an API that never runs dry cannot loop forever
+FETCH_MAX_PAGES = int(os.getenv("FETCH_MAX_PAGES", "1000"))
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Keys that commonly hold the records of a paged response object
+DEFAULT_ITEMS_FIELDS = ["data", "results", "items", "records"]
+
+
+def request_with_retries(
+    client: httpx.Client,
+    method: str,
+    url: str,
+    max_retries: int = FETCH_MAX_RETRIES,
+    backoff: float = FETCH_RETRY_BACKOFF,
+    retry_unsafe: bool = FETCH_RETRY_UNSAFE_METHODS,
+    **kwargs
+) -> httpx.Response:
+    """
+    Send a request, retrying transport errors and 429/5xx responses with
+    exponential backoff. A numeric Retry-After header overrides the delay,
+    capped at FETCH_MAX_RETRY_AFTER. Only GET, HEAD and OPTIONS are retried
+    unless `retry_unsafe` is set.
+    """
+    if method.upper() not in SAFE_METHODS and not retry_unsafe:
+        max_retries = 0
+    for attempt in range(max_retries + 1):
+        try:
+            response = client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if attempt == max_retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+            continue
+
+        if response.status_code not in RETRY_STATUS_CODES or attempt == max_retries:
+            # 304 answers a conditional request from the HTTP cache, not an error
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
+
+        retry_after = response.headers.get("retry-after", "")
+        delay = float(retry_after) if retry_after.isdigit() else backoff * 2 ** attempt
+        delay = min(delay, FETCH_MAX_RETRY_AFTER)
+        time.sleep(delay)
+
+
+def _get_field(data: Any, field: str) -> Any:
+    # Dotted paths reach into nested objects, e.g. "meta.next_cursor"
+    for part in field.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+def _extract_items(data: Any, items_field: Optional[str], wrap_objects: bool = True) -> List[Any]:
+    if items_field:
+        items = _get_field(data, items_field)
+        return items if isinstance(items, list) else []
+    if isinstance(data, list):
+        return data
+    for field in DEFAULT_ITEMS_FIELDS:
+        if isinstance(data, dict) and isinstance(data.get(field), list):
+            return data[field]
+    # Numbered pages must come back empty eventually, so never wrap there
+    return [data] if wrap_objects else []
+
+
+def _numbered_pages(
+    fetch_page: Callable[[int], List[Any]],
+    first: int,
+    step: int,
+    page_size: Optional[int],
+    max_pages: int,
+    concurrency: int
+) -> Iterator[List[Any]]:
+    """
+    Fetch page/offset-numbered pages `concurrency` at a time, in order.
+
+    Pagination ends at the first empty page, a short page when the page size
+    is known, or a page identical to the one before it (an API that ignores
+    the page parameter); pages fetched speculatively beyond it are discarded.
+    """
+    fetched = 0
+    previous = None
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fetch-page") as pool:
+        while fetched < max_pages:
+            window = min(concurrency, max_pages - fetched)
+            numbers = [first + (fetched + i) * step for i in range(window)]
+            for items in pool.map(fetch_page, numbers):
+                fetched += 1
+                if not items or items == previous:
+                    return
+                yield items
+                if page_size and len(items) < page_size:
+                    return
+                previous = items
+
+
+def iter_pages(
+    client: httpx.Client,
+    http_method: str,
+    api_url: str,
+    request_headers: Dict[str, Any],
+    request_params: Dict[str, Any],
+    pagination: Dict[str, Any]
+) -> Iterator[List[Any]]:
+    """
+    Yield the records of each page in order.
+
+    `pagination["type"]` selects the scheme:
+    - "page": `page_param` counts up from `start_page`
+    - "offset": `offset_param` advances by `page_size` (sent as `limit_param`)
+    - "link": follow the `Link: <...>; rel="next"` response header
+    - "cursor": send `cursor_field` from each body back as `cursor_param`
+    Page and offset pages are fetched concurrently; link and cursor pages
+    depend on the previous response so they are sequential, and stop when a
+    next URL or cursor repeats. At most `max_pages` pages are fetched
+    (default FETCH_MAX_PAGES). Set `retry_unsafe_methods` to retry non-GET
+    requests.
+    """
+    pagination_type = pagination.get("type", "page")
+    items_field = pagination.get("items_field")
+    page_size = pagination.get("page_size")
+    max_pages = int(pagination.get("max_pages") or FETCH_MAX_PAGES)
+    concurrency = max(1, int(pagination.get("concurrency", FETCH_CONCURRENCY)))
+    retry = {
+        "max_retries": int(pagination.get("max_retries", FETCH_MAX_RETRIES)),
+        "backoff": float(pagination.get("retry_backoff", FETCH_RETRY_BACKOFF)),
+        "retry_unsafe": bool(pagination.get("retry_unsafe_methods", FETCH_RETRY_UNSAFE_METHODS))
+    }
+
+    def send(method: str, url: str, **kwargs) -> httpx.Response:
+        return request_with_retries(client, method, url, **kwargs, **retry)
+
+    def get(url: str, params: Optional[Dict[str, Any]]) -> httpx.Response:
+        return http_cache.request(
+            client, http_method, url, send=send, headers=request_headers, params=params
+        )
+
+    if pagination_type in ("page", "offset"):
+        if pagination_type == "page":
+            number_param = pagination.get("page_param", "page")
+            first, step = int(pagination.get("start_page", 1)), 1
+            size_param = pagination.get("page_size_param")
+        else:
+            number_param = pagination.get("offset_param", "offset")
+            page_size = int(page_size or 100)
+            first, step = int(pagination.get("start_offset", 0)), page_size
+            size_param = pagination.get("limit_param", "limit")
+
+        def fetch_page(number: int) -> List[Any]:
+            params = {**request_params, number_param: number}
+            if size_param and page_size:
+                params[size_param] = page_size
+            data = loads_json(get(api_url, params).content)
+            return _extract_items(data, items_field, wrap_objects=False)
+
+        yield from _numbered_pages(fetch_page, first, step, page_size, max_pages, concurrency)
+        return
+
+    if pagination_type not in ("link", "cursor"):
+        raise ValueError(f"Unsupported pagination type: {pagination_type}")
+
+    cursor_field = pagination.get("cursor_field", "next_cursor")
+    cursor_param = pagination.get("cursor_param", "cursor")
+    url, params = api_url, dict(request_params)
+    # Next URLs and cursors already followed; seeing one again means a cycle
+    visited = {url}
+    for _ in range(max_pages):
+        response = get(url, params)
+        data = loads_json(response.content)
+        items = _extract_items(data, items_field)
+        if items:
+            yield items
+
+        if pagination_type == "link":
+            next_url = response.links.get("next", {}).get("url")
+            if not next_url:
+                return
+            # The next link carries its own query string; an empty dict would strip it
+            url, params = str(response.url.join(next_url)), None
+            if url in visited:
+                return
+            visited.add(url)
+        else:
+            cursor = _get_field(data, cursor_field)
+            if cursor is None or cursor == "" or not items or repr(cursor) in visited:
+                return
+            visited.add(repr(cursor))
+            params = {**request_params, cursor_param: cursor}
+
+
+def write_pages(pages: Iterator[List[Any]], output_file_path: str, output_format: str = "json") -> Dict[str, int]:
+    """
+    Write paged records incrementally, as one merged JSON array or as JSON
+    Lines, and return page and item counts.
+    """
+    counts = {"pages": 0, "items": 0}
+
+    def counted_items() -> Iterator[Any]:
+        for items in pages:
+            counts["pages"] += 1
+            counts["items"] += len(items)
+            yield from items
+
+    if output_format.lower() not in JSON_LINES_FORMATS:
+        output_format = "json"
+    with open_sink(output_file_path, output_format) as sink:
+        for item in counted_items():
+            sink.write(item)
+    return counts
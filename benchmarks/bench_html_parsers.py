@@ -0,0 +1,76 @@
+"""
+Measure pages/second for each installed HTML parser backend and check that
+each one extracts the same data and links as the default bs4 backend.
+
+Usage: python benchmarks/bench_html_parsers.py [corpus_dir] [selector ...]
+corpus_dir holds saved .html pages; without it a synthetic corpus is used.
+"""
+import glob
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_extractors import available_backends, make_extractor
+
+DEFAULT_SELECTORS = ["h1", "h2", "p.summary", "ul li a", "table td"]
+SYNTHETIC_PAGES = 200
+
+
+def synthetic_page(rng):
+    items = "".join(
+        f'<li><a href="/item/{rng.randint(0, 10**6)}">Item {i}</a></li>' for i in range(50)
+    )
+    rows = "".join(
+        f"<tr><td>{rng.random():.4f}</td><td>row {i}</td></tr>" for i in range(100)
+    )
+    paragraphs = "".join(
+        f'<p class="summary">Paragraph {i} with <b>bold</b> text.</p>' for i in range(30)
+    )
+    return (
+        f"<html><head><title>Page</title></head><body><h1>Title</h1>"
+        f"<h2>Section</h2>{paragraphs}<ul>{items}</ul><table>{rows}</table></body></html>"
+    )
+
+
+def load_corpus(corpus_dir):
+    if corpus_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(corpus_dir, "**", "*.htm*"), recursive=True)):
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                pages.append(f.read())
+        return pages
+    rng = random.Random(0)
+    return [synthetic_page(rng) for _ in range(SYNTHETIC_PAGES)]
+
+
+def main():
+    corpus_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    selectors = sys.argv[2:] or DEFAULT_SELECTORS
+    pages = load_corpus(corpus_dir)
+    if not pages:
+        sys.exit(f"No .html pages found in {corpus_dir}")
+
+    size_mb = sum(len(page) for page in pages) / 1e6
+    print(f"{len(pages)} pages, {size_mb:.1f} MB, selectors: {selectors}")
+    print(f"{'backend':>12} {'seconds':>10} {'pages/s':>10} {'differ':>8}")
+    expected = None
+    diverged = []
+    for backend in available_backends():
+        extract = make_extractor(selectors, backend)
+        start = time.perf_counter()
+        results = [extract(page, "http://example.com/") for page in pages]
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            expected = results
+        differ = sum(result != reference for result, reference in zip(results, expected))
+        if differ:
+            diverged.append(backend)
+        print(f"{backend:>12} {elapsed:>10.3f} {len(pages) / elapsed:>10.1f} {differ:>8}")
+    if diverged:
+        sys.exit(f"Backends diverged from bs4: {', '.join(diverged)}")
+
+if __name__ == "__main__":
+    main()
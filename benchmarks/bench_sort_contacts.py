@@ -0,0 +1,53 @@
+"""
+Compare the row-wise key sort with the columnar lexsort for contacts.
+
+Usage: python benchmarks/bench_sort_contacts.py [size ...]
+Defaults to 10k, 1M and 10M contacts; 10M needs several GB of RAM.
+"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_sorting import sort_contacts_by_key, sort_contacts_columnar
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+SORT_ATTRIBUTES = ["last_name", "first_name"]
+
+
+def make_contacts(count, seed=0):
+    rng = random.Random(seed)
+    first_names = ["".join(rng.choices(string.ascii_letters, k=6)) for _ in range(5000)]
+    last_names = ["".join(rng.choices(string.ascii_letters, k=8)) for _ in range(20000)]
+    return [
+        {
+            "first_name": rng.choice(first_names),
+            "last_name": rng.choice(last_names),
+            "email": f"user{i}@example.com"
+        }
+        for i in range(count)
+    ]
+
+
+def time_sort(sort_function, contacts):
+    start = time.perf_counter()
+    result = sort_function(contacts, SORT_ATTRIBUTES)
+    return time.perf_counter() - start, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"{'contacts':>12} {'key sort (s)':>14} {'columnar (s)':>14} {'speedup':>8}")
+    for size in sizes:
+        contacts = make_contacts(size)
+        key_time, key_result = time_sort(sort_contacts_by_key, contacts)
+        columnar_time, columnar_result = time_sort(sort_contacts_columnar, contacts)
+        assert key_result == columnar_result, "columnar sort diverged from key sort"
+        print(f"{size:>12,} {key_time:>14.3f} {columnar_time:>14.3f} {key_time / columnar_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import hashlib
+import io
+import os
+from typing import Tuple
+
+from plan_cache import PlanCache
+
+try:
+    from PIL import Image, ImageChops, ImageOps
+except ImportError:
+    Image = None
+
+CARD_IMAGE_MAX_SIDE = int(os.getenv("CARD_IMAGE_MAX_SIDE", "1024"))
+CARD_RESULT_CACHE_PATH = os.getenv("CARD_RESULT_CACHE_PATH", ".cache/card_results.json")
+CARD_RESULT_CACHE_SIZE = int(os.getenv("CARD_RESULT_CACHE_SIZE", "256"))
+CARD_RESULT_CACHE_TTL = float(os.getenv("CARD_RESULT_CACHE_TTL", "0"))
+
+# Pixels closer than this to the border colour count as background when cropping
+_CROP_THRESHOLD = 16
+
+# Results depend only on the image bytes and the instruction, so entries never expire by default
+card_result_cache = PlanCache(CARD_RESULT_CACHE_PATH, CARD_RESULT_CACHE_SIZE, CARD_RESULT_CACHE_TTL)
+
+
+def image_cache_key(image_bytes: bytes, process_instruction: str) -> str:
+    digest = hashlib.sha256(image_bytes)
+    digest.update(b"\0" + process_instruction.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _crop_border(image):
+    """Trim the uniform margin around the card, keyed on the top-left pixel colour."""
+    background = Image.new(image.mode, image.size, image.getpixel((0, 0)))
+    diff = ImageChops.difference(image, background).point(lambda p: 255 if p > _CROP_THRESHOLD else 0)
+    bbox = diff.getbbox()
+    return image.crop(bbox) if bbox else image
+
+
+def preprocess_image(image_bytes: bytes, max_side: int = CARD_IMAGE_MAX_SIDE) -> Tuple[bytes, str]:
+    """
+    Shrink a card image to what the model needs: greyscale, border cropped
+    and the longest side capped at `max_side`, re-encoded as optimized PNG.
+
+    Returns (image_bytes, mime_type). The original is returned unchanged when
+    Pillow is not installed, the image cannot be decoded, or the processed
+    image would not be smaller.
+    """
+    if Image is None:
+        return image_bytes, "image/png"
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as original:
+            mime_type = Image.MIME.get(original.format, "image/png")
+            image = ImageOps.exif_transpose(original).convert("L")
+    except (OSError, ValueError) as e:
+        print(f"Skipping image preprocessing: {e}")
+        return image_bytes, "image/png"
+
+    image = _crop_border(image)
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side), Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    processed = buffer.getvalue()
+    if len(processed) >= len(image_bytes):
+        return image_bytes, mime_type
+    return processed, "image/png"
@@ -0,0 +1,98 @@
+import io
+import os
+import re
+import shutil
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import pytesseract
+    from PIL import Image
+except ImportError:
+    pytesseract = None
+
+# Minimum mean tesseract word confidence (0-100) to trust a candidate without the LLM
+CARD_OCR_MIN_CONFIDENCE = float(os.getenv("CARD_OCR_MIN_CONFIDENCE", "80"))
+
+# Single block of text, digits and separators only
+_OCR_CONFIG = "--psm 6 -c tessedit_char_whitelist=0123456789-"
+
+# 13 to 19 digits, optionally grouped with spaces or dashes
+CARD_NUMBER_RE = re.compile(r"(?<!\d)(?:\d[ -]?){12,18}\d(?!\d)")
+
+
+def luhn_valid(number: str) -> bool:
+    """Luhn checksum over a string of digits."""
+    if not number.isdigit():
+        return False
+    total = 0
+    for index, digit in enumerate(reversed(number)):
+        value = int(digit)
+        if index % 2 == 1:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return total % 10 == 0
+
+
+def find_card_numbers(text: str) -> List[str]:
+    """Luhn-valid card numbers in `text`, digits only, in order of appearance."""
+    numbers = []
+    for match in CARD_NUMBER_RE.finditer(text):
+        number = re.sub(r"\D", "", match.group())
+        if luhn_valid(number) and number not in numbers:
+            numbers.append(number)
+    return numbers
+
+
+def ocr_available() -> bool:
+    return pytesseract is not None and shutil.which(pytesseract.pytesseract.tesseract_cmd) is not None
+
+
+def _ocr_lines(image_bytes: bytes) -> List[Tuple[str, float]]:
+    """Run tesseract and return (text, mean word confidence) for every line."""
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        data = pytesseract.image_to_data(image, config=_OCR_CONFIG, output_type=pytesseract.Output.DICT)
+
+    lines: Dict[Tuple[int, int, int], List[Tuple[str, float]]] = {}
+    for index, word in enumerate(data["text"]):
+        confidence = float(data["conf"][index])
+        if not word.strip() or confidence < 0:
+            continue
+        key = (data["block_num"][index], data["par_num"][index], data["line_num"][index])
+        lines.setdefault(key, []).append((word.strip(), confidence))
+
+    return [
+        (" ".join(word for word, _ in words), sum(conf for _, conf in words) / len(words))
+        for _, words in sorted(lines.items())
+    ]
+
+
+def ocr_card_number(image_bytes: bytes) -> Tuple[Optional[str], float]:
+    """
+    Read a card number from an image with local OCR.
+
+    Returns (number, confidence) for the most confident Luhn-valid candidate,
+    or (None, 0.0) when OCR is unavailable or nothing valid was read. The
+    caller decides whether the confidence is high enough to skip the LLM.
+    """
+    if not ocr_available():
+        return None, 0.0
+    try:
+        lines = _ocr_lines(image_bytes)
+    except (OSError, RuntimeError, pytesseract.TesseractError) as e:
+        print(f"Local OCR failed: {e}")
+        return None, 0.0
+
+    candidates: Dict[str, float] = {}
+    for text, confidence in lines:
+        for number in find_card_numbers(text):
+            candidates[number] = max(confidence, candidates.get(number, 0.0))
+    if not candidates:
+        return None, 0.0
+
+    number, confidence = max(candidates.items(), key=lambda item: item[1])
+    if len(candidates) > 1:
+        # Several different valid numbers on one card means something was misread
+        confidence = min(confidence, CARD_OCR_MIN_CONFIDENCE - 1)
+    return number, confidence
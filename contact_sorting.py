@@ -0,0 +1,40 @@
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+def contact_sort_key(sort_attributes: List[str]) -> Callable[[Dict[str, Any]], List[str]]:
+    """Per-record key: each sort attribute as a lowercased string, missing as ""."""
+    return lambda x: [str(x.get(attr, "")).lower() for attr in sort_attributes]
+
+
+def sort_contacts_by_key(contacts: List[Any], sort_attributes: List[str]) -> List[Any]:
+    """Row-wise sort with a key list per record; works for any input shape."""
+    return sorted(contacts, key=contact_sort_key(sort_attributes))
+
+
+def sort_contacts_columnar(contacts: List[Dict[str, Any]], sort_attributes: List[str]) -> List[Dict[str, Any]]:
+    """
+    Sort records by extracting each attribute once into a column.
+
+    Every column is factorized into integer codes in string order and the
+    codes are stably lexsorted, so the result matches `sort_contacts_by_key`
+    without building a key list per record.
+    """
+    codes = []
+    for attr in sort_attributes:
+        column = [str(contact.get(attr, "")).lower() for contact in contacts]
+        column_codes, _ = pd.factorize(pd.Series(column, dtype=object), sort=True)
+        codes.append(column_codes)
+
+    # np.lexsort uses the last key as primary, so reverse priority order
+    order = np.lexsort(codes[::-1])
+    return [contacts[i] for i in order]
+
+
+def sort_contacts(contacts: List[Any], sort_attributes: List[str]) -> List[Any]:
+    """Use the columnar sort for lists of dicts, else fall back to the key sort."""
+    if sort_attributes and contacts and all(isinstance(contact, dict) for contact in contacts):
+        return sort_contacts_columnar(contacts, sort_attributes)
+    return sort_contacts_by_key(contacts, sort_attributes)
@@ -118,6 +118,10 @@ custom_function = [{
             "lines_per_file": {
                 "type": "integer",
                 "description": "number of lines to extract from each file"
+            },
+            "read_from_end": {
+                "type": "boolean",
+                "description": "true to take the last lines of each file instead of the first"
             }
         }
     }
@@ -221,6 +225,48 @@ custom_function = [{
             "request_params": {
                 "type": "object",
                 "description": "query parameters for the API request"
+            },
+            "stream_to_file": {
+                "type": "boolean",
+                "description": "true to stream a large response straight to the output file"
+            },
+            "pretty_print_json": {
+                "type": "boolean",
+                "description": "true to validate and indent the streamed JSON response"
+            },
+            "pagination": {
+                "type": "object",
+                "description": "paging scheme when the API returns results in pages",
+                "properties": {
+                    "type": {
+                        "type": "string",
+                        "description": "page, offset, link or cursor"
+                    },
+                    "page_param": {
+                        "type": "string",
+                        "description": "query parameter holding the page number"
+                    },
+                    "page_size": {
+                        "type": "integer",
+                        "description": "number of records per page"
+                    },
+                    "items_field": {
+                        "type": "string",
+                        "description": "response field holding the records of a page"
+                    },
+                    "cursor_field": {
+                        "type": "string",
+                        "description": "response field holding the next cursor"
+                    },
+                    "max_pages": {
+                        "type": "integer",
+                        "description": "maximum number of pages to fetch, 1000 by default"
+                    }
+                }
+            },
+            "output_format": {
+                "type": "string",
+                "description": "json for a merged array or jsonl for JSON Lines"
             }
         }
     }
@@ -247,7 +293,7 @@ custom_function = [{
             },
             "data_format": {
                 "type": "string",
-                "description": "format to save the data (json, csv, etc.)"
+                "description": "format to save the data (json, jsonl or csv)"
             },
             "max_depth": {
                 "type": "integer",
@@ -255,4 +301,52 @@ custom_function = [{
             }
         }
     }
-}]
\ No newline at end of file
+}]
+
+# Step arguments are named like the parameters of the function the step calls
+_step_argument_properties = {}
+for _function in custom_function:
+    for _name, _schema in _function["parameters"]["properties"].items():
+        _step_argument_properties.setdefault(_name, _schema)
+
+custom_function.append({
+    "name": "run_multi_step_plan",
+    "description": "Use when the passed string asks for several of the other operations in sequence, e.g. fetch data from an API, then sort it, then count something in it",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "steps": {
+                "type": "array",
+                "description": "the operations to perform, in the order they are described",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {
+                            "type": "string",
+                            "description": "short unique name for the step"
+                        },
+                        "function": {
+                            "type": "string",
+                            "description": "name of one of the other functions",
+                            "enum": [function["name"] for function in custom_function]
+                        },
+                        "arguments": {
+                            "type": "object",
+                            "description": "arguments for that function, named as in its parameters; use ${step_id.field} to pass a field of an earlier step's result",
+                            "properties": _step_argument_properties
+                        },
+                        "depends_on": {
+                            "type": "array",
+                            "description": "ids of steps that must finish first",
+                            "items": {
+                                "type": "string"
+                            }
+                        }
+                    },
+                    "required": ["function", "arguments"]
+                }
+            }
+        },
+        "required": ["steps"]
+    }
+})
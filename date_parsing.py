@@ -0,0 +1,106 @@
+import functools
+import itertools
+import os
+from typing import List, Optional
+
+import dateparser
+import numpy as np
+import pandas as pd
+
+# Unambiguous formats parsed in bulk with pandas. Day/month-ambiguous forms such
+# as 01/02/2020 are deliberately absent so they keep dateparser's interpretation.
+CANDIDATE_DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y/%m/%d",
+    "%Y/%m/%d %H:%M:%S",
+    "%d-%b-%Y",
+    "%d %b %Y",
+    "%b %d, %Y",
+    "%B %d, %Y",
+    "%d %B %Y",
+]
+FORMAT_SAMPLE_SIZE = 1000
+DATE_CHUNK_LINES = int(os.getenv("DATE_CHUNK_LINES", "100000"))
+
+
+class DateParseError(ValueError):
+    """Raised when a line can't be parsed by any format or by dateparser."""
+
+    def __init__(self, date_str: str):
+        super().__init__(f"Could not parse date: {date_str}")
+        self.date_str = date_str
+
+
+@functools.lru_cache(maxsize=65536)
+def _dateparser_weekday(date_str: str) -> Optional[int]:
+    # Dates repeat heavily in real files, and dateparser runs language detection per call
+    parsed = dateparser.parse(date_str)
+    return parsed.weekday() if parsed else None
+
+
+def detect_date_formats(lines: List[str], sample_size: int = FORMAT_SAMPLE_SIZE) -> List[str]:
+    """Return the candidate formats present in an evenly spaced sample of `lines`."""
+    if not lines:
+        return []
+    step = max(1, len(lines) // sample_size)
+    sample = pd.Series(lines[::step][:sample_size], dtype=object)
+
+    detected = []
+    for date_format in CANDIDATE_DATE_FORMATS:
+        parsed = pd.to_datetime(sample, format=date_format, errors="coerce")
+        if parsed.notna().any():
+            detected.append(date_format)
+    return detected
+
+
+def parse_weekdays(lines: List[str], date_formats: Optional[List[str]] = None) -> np.ndarray:
+    """
+    Parse date strings and return their weekdays (Monday=0) as an int array.
+
+    Each detected format group is parsed in bulk with `pandas.to_datetime`;
+    only the leftovers go through (memoized) `dateparser`, so results match
+    a plain per-line `dateparser.parse` loop.
+    """
+    if date_formats is None:
+        date_formats = detect_date_formats(lines)
+
+    values = pd.Series(lines, dtype=object)
+    weekdays = np.full(len(values), -1, dtype=np.int8)
+    remaining = np.ones(len(values), dtype=bool)
+
+    for date_format in date_formats:
+        if not remaining.any():
+            break
+        parsed = pd.to_datetime(values[remaining], format=date_format, errors="coerce")
+        matched = parsed.notna().to_numpy()
+        indices = np.flatnonzero(remaining)[matched]
+        weekdays[indices] = parsed[matched].dt.dayofweek.to_numpy()
+        remaining[indices] = False
+
+    for index in np.flatnonzero(remaining):
+        weekday = _dateparser_weekday(lines[index])
+        if weekday is None:
+            raise DateParseError(lines[index])
+        weekdays[index] = weekday
+
+    return weekdays
+
+
+def count_weekdays_in_file(file_path: str, chunk_lines: int = DATE_CHUNK_LINES) -> List[int]:
+    """
+    Stream a one-date-per-line file and return counts for all seven weekdays
+    (Monday first).
+
+    The file is read `chunk_lines` at a time and formats are re-detected per
+    chunk, so memory stays bounded by the chunk size rather than the file.
+    """
+    counts = np.zeros(7, dtype=np.int64)
+    with open(file_path, 'r') as file:
+        while True:
+            lines = [line.strip() for line in itertools.islice(file, chunk_lines)]
+            if not lines:
+                break
+            counts += np.bincount(parse_weekdays(lines), minlength=7)
+    return counts.tolist()
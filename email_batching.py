@@ -0,0 +1,75 @@
+import email
+import email.policy
+import os
+import re
+from email.utils import getaddresses
+from typing import List, Optional
+
+EMAIL_CHUNK_CHARS = int(os.getenv("EMAIL_CHUNK_CHARS", "60000"))
+EMAIL_LLM_CONCURRENCY = int(os.getenv("EMAIL_LLM_CONCURRENCY", "4"))
+
+ADDRESS_RE = re.compile(r"^[\w.+'-]+@[\w-]+(?:\.[\w-]+)+$")
+MBOX_SEPARATOR_RE = re.compile(r"^From \S+.*$", re.MULTILINE)
+FROM_HEADER_RE = re.compile(r"^From:", re.MULTILINE | re.IGNORECASE)
+# Only plain "extract the sender's email" phrasings are answered from headers;
+# anything more (formatting, filtering, other fields) goes to the LLM as written
+SENDER_INSTRUCTION_RE = re.compile(
+    r"(?:please\s+)?(?:(?:extract|get|find|list|return|identify)\s+)?(?:the\s+|all\s+(?:the\s+)?)?"
+    r"(?:senders?(?:'s?)?\s+(?:e-?mail\s+)?(?:address(?:es)?|e-?mails?)"
+    r"|(?:e-?mail\s+)?address(?:es)?\s+of\s+(?:the\s+)?senders?)"
+    r"(?:\s+(?:from|in|of)\s+(?:the\s+|this\s+|each\s+)?(?:e-?mails?|messages?|text|file))?",
+    re.IGNORECASE
+)
+
+
+def split_messages(text: str) -> List[str]:
+    """
+    Split a mailbox into messages.
+
+    mbox "From " separator lines are used when present; otherwise a new
+    message starts at each "From:" header that follows a blank line.
+    """
+    if MBOX_SEPARATOR_RE.search(text):
+        parts = MBOX_SEPARATOR_RE.split(text)
+        return [part.strip("\n") for part in parts if part.strip()]
+
+    starts = [
+        match.start() for match in FROM_HEADER_RE.finditer(text)
+        if match.start() == 0 or text[:match.start()].endswith("\n\n")
+    ]
+    if len(starts) <= 1:
+        return [text] if text.strip() else []
+    starts[0] = 0
+    return [text[start:end].strip("\n") for start, end in zip(starts, starts[1:] + [len(text)])]
+
+
+def is_sender_instruction(process_instruction: str) -> bool:
+    """True when the instruction only asks for sender addresses, which headers answer."""
+    process_instruction = " ".join((process_instruction or "").split()).rstrip(".!")
+    return bool(SENDER_INSTRUCTION_RE.fullmatch(process_instruction))
+
+
+def local_sender(message: str) -> Optional[str]:
+    """Return the From: address when it parses cleanly, else None so the LLM decides."""
+    headers = email.message_from_string(message, policy=email.policy.compat32)
+    from_values = headers.get_all("From") or []
+    addresses = [address for _, address in getaddresses(from_values) if address]
+    if len(addresses) != 1 or not ADDRESS_RE.match(addresses[0]):
+        return None
+    return addresses[0]
+
+
+def chunk_messages(messages: List[str], max_chars: int = EMAIL_CHUNK_CHARS) -> List[List[str]]:
+    """Group messages into prompt-sized chunks; an oversized message gets its own chunk."""
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for message in messages:
+        if current and size + len(message) > max_chars:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(message)
+        size += len(message)
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,65 @@
+import heapq
+import json
+import os
+import tempfile
+from typing import Any, Callable, Iterable, Iterator, List
+
+CONTACT_SORT_MEMORY_BUDGET_MB = float(os.getenv("CONTACT_SORT_MEMORY_BUDGET_MB", "256"))
+
+# Python objects take several times their JSON size in memory
+OBJECT_OVERHEAD_FACTOR = 4
+
+
+def _spill_run(items: List[Any], key: Callable[[Any], Any], directory: str) -> str:
+    items.sort(key=key)
+    fd, run_path = tempfile.mkstemp(suffix=".jsonl", dir=directory)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        for item in items:
+            f.write(json.dumps(item))
+            f.write("\n")
+    return run_path
+
+
+def _read_run(run_path: str) -> Iterator[Any]:
+    with open(run_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def external_sort(
+    items: Iterable[Any],
+    key: Callable[[Any], Any],
+    memory_budget_mb: float = CONTACT_SORT_MEMORY_BUDGET_MB
+) -> Iterator[Any]:
+    """
+    Stably sort an iterable that may not fit in memory.
+
+    Items are collected into runs of roughly `memory_budget_mb`, each run is
+    sorted and spilled to a temporary JSON Lines file, and the runs are
+    k-way merged lazily. Temporary files are removed once the merge finishes.
+    """
+    budget_bytes = memory_budget_mb * 1024 * 1024
+    with tempfile.TemporaryDirectory(prefix="external-sort-") as directory:
+        run_paths = []
+        run: List[Any] = []
+        run_bytes = 0
+        for item in items:
+            run.append(item)
+            run_bytes += len(json.dumps(item)) * OBJECT_OVERHEAD_FACTOR
+            if run_bytes >= budget_bytes:
+                run_paths.append(_spill_run(run, key, directory))
+                run = []
+                run_bytes = 0
+
+        # Everything fit in a single run, so no merge is needed
+        if not run_paths:
+            run.sort(key=key)
+            yield from run
+            return
+
+        if run:
+            run_paths.append(_spill_run(run, key, directory))
+            run = []
+
+        # heapq.merge breaks ties by run order, which keeps the sort stable
+        yield from heapq.merge(*(_read_run(path) for path in run_paths), key=key)
@@ -0,0 +1,77 @@
+import asyncio
+import functools
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Union
+
+TAIL_BLOCK_SIZE = 8192
+FILE_READ_PARALLELISM = int(os.getenv("FILE_READ_PARALLELISM", "16"))
+
+# Kept apart from the task pool so scanner I/O never waits behind slow handlers
+_file_read_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_file_read_pool() -> ThreadPoolExecutor:
+    """Return the file read pool, creating it on first use and again after a shutdown."""
+    global _file_read_pool
+    if _file_read_pool is None:
+        _file_read_pool = ThreadPoolExecutor(
+            max_workers=FILE_READ_PARALLELISM,
+            thread_name_prefix="file-read"
+        )
+    return _file_read_pool
+
+
+def shutdown_file_readers() -> None:
+    global _file_read_pool
+    if _file_read_pool is not None:
+        _file_read_pool.shutdown(wait=False, cancel_futures=True)
+        _file_read_pool = None
+
+
+def head_lines(file_path: str, num_lines: int) -> List[str]:
+    """Return the first `num_lines` lines of a file without reading the rest."""
+    with open(file_path, 'r') as f:
+        return list(itertools.islice(f, num_lines))
+
+
+def tail_lines(file_path: str, num_lines: int) -> List[str]:
+    """Return the last `num_lines` lines of a file by seeking backwards in blocks."""
+    if num_lines <= 0:
+        return []
+    with open(file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        # One extra newline is needed since the file usually ends with one
+        while position > 0 and data.count(b"\n") <= num_lines:
+            read_size = min(TAIL_BLOCK_SIZE, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+    if position > 0:
+        # The block may start inside a multibyte character; the partial first line is not needed
+        data = data[data.index(b"\n") + 1:]
+    lines = data.decode().splitlines(keepends=True)
+    return lines[-num_lines:]
+
+
+async def read_files(
+    reader: Callable[..., Any],
+    file_paths: Iterable[str],
+    *args
+) -> List[Union[Any, Exception]]:
+    """
+    Apply a blocking `reader(path, *args)` to many files concurrently.
+
+    At most FILE_READ_PARALLELISM files are open at once. Results come back
+    in input order; a failing file yields its exception instead of a result.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_file_read_pool()
+    futures = [
+        loop.run_in_executor(pool, functools.partial(reader, path, *args))
+        for path in file_paths
+    ]
+    return await asyncio.gather(*futures, return_exceptions=True)
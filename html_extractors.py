@@ -0,0 +1,104 @@
+import os
+from typing import Callable, Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+import soupsieve
+
+from web_crawler import extract_links
+
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+# BeautifulSoup is the default; lxml and selectolax are faster opt-ins, but their
+# parsers repair broken markup differently (selectolax builds an HTML5 tree), so
+# selectors can match different elements. Check with benchmarks/bench_html_parsers.py.
+HTML_PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "bs4")
+
+PageExtractor = Callable[[str, str], Tuple[Dict, List[str]]]
+
+
+def available_backends() -> List[str]:
+    backends = ["bs4"]
+    if lxml is not None:
+        backends.append("lxml")
+    if SelectolaxParser is not None:
+        backends.append("selectolax")
+    return backends
+
+
+def _bs4_extractor(css_selectors: List[str]) -> PageExtractor:
+    compiled = [(selector, soupsieve.compile(selector)) for selector in css_selectors]
+    links_selector = soupsieve.compile('a[href]')
+
+    def extract(html: str, url: str):
+        soup = BeautifulSoup(html, 'html.parser')
+        page_data = {"url": url}
+        for selector, matcher in compiled:
+            page_data[selector] = [elem.text.strip() for elem in matcher.select(soup)]
+        links = extract_links(url, [a.get('href') for a in links_selector.select(soup)])
+        return page_data, links
+
+    return extract
+
+
+def _lxml_extractor(css_selectors: List[str]) -> PageExtractor:
+    compiled = [(selector, CSSSelector(selector)) for selector in css_selectors]
+
+    def extract(html: str, url: str):
+        page_data = {"url": url}
+        try:
+            tree = lxml.html.document_fromstring(html)
+        except ValueError:
+            # lxml refuses str input carrying an XML encoding declaration
+            tree = lxml.html.document_fromstring(html.encode())
+        except lxml.etree.ParserError:
+            return {**page_data, **{selector: [] for selector in css_selectors}}, []
+        for selector, matcher in compiled:
+            page_data[selector] = [elem.text_content().strip() for elem in matcher(tree)]
+        links = extract_links(url, tree.xpath('//a/@href'))
+        return page_data, links
+
+    return extract
+
+
+def _selectolax_extractor(css_selectors: List[str]) -> PageExtractor:
+    def extract(html: str, url: str):
+        tree = SelectolaxParser(html)
+        page_data = {"url": url}
+        for selector in css_selectors:
+            page_data[selector] = [node.text(deep=True).strip() for node in tree.css(selector)]
+        links = extract_links(url, [node.attributes.get('href') for node in tree.css('a[href]')])
+        return page_data, links
+
+    return extract
+
+
+_EXTRACTORS = {
+    "bs4": _bs4_extractor,
+    "lxml": _lxml_extractor,
+    "selectolax": _selectolax_extractor,
+}
+
+
+def make_extractor(css_selectors: List[str], backend: str = HTML_PARSER_BACKEND) -> PageExtractor:
+    """
+    Build a page extractor for one crawl, compiling the CSS selectors once.
+
+    The extractor takes (html, url) and returns the page data (url plus the
+    stripped text of every match per selector) and the page's links.
+    """
+    backend = (backend or "bs4").lower()
+    if backend not in available_backends():
+        raise ValueError(f"HTML parser backend not available: {backend}")
+    return _EXTRACTORS[backend](css_selectors)
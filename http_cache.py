@@ -0,0 +1,265 @@
+import email.utils
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from task_runner import run_in_thread
+
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", ".cache/http")
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Bodies are stored decoded, so transfer headers describing the wire format are dropped
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+# Responses to credentialed requests are private to the caller (RFC 9111 section 3.5)
+_CREDENTIAL_HEADERS = ("authorization", "cookie")
+
+cache_stats = {"hits": 0, "revalidated": 0, "misses": 0, "bypassed": 0}
+
+
+def _parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    directives = {}
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def _freshness_lifetime(headers: Dict[str, str]) -> float:
+    """Seconds a stored response may be reused without revalidation."""
+    directives = _parse_cache_control(headers.get("cache-control", ""))
+    if "no-cache" in directives:
+        return 0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "") and directives[name].isdigit():
+            return int(directives[name])
+    expires = headers.get("expires")
+    date = headers.get("date")
+    if expires:
+        try:
+            expires_at = email.utils.parsedate_to_datetime(expires).timestamp()
+            date_at = email.utils.parsedate_to_datetime(date).timestamp() if date else time.time()
+            return max(0, expires_at - date_at)
+        except (TypeError, ValueError):
+            return 0
+    return 0
+
+
+def _is_storable(response: httpx.Response, request_headers: Dict[str, str]) -> bool:
+    if response.status_code != 200:
+        return False
+    response_directives = _parse_cache_control(response.headers.get("cache-control", ""))
+    request_directives = _parse_cache_control(request_headers.get("cache-control", ""))
+    if "no-store" in response_directives or "no-store" in request_directives:
+        return False
+    # Varying responses would need the request headers in the key
+    vary = response.headers.get("vary", "").lower().replace(" ", "")
+    if vary not in ("", "accept-encoding"):
+        return False
+    # An entry that is never fresh and cannot be revalidated would only be refetched
+    return (
+        _freshness_lifetime(response.headers) > 0
+        or "etag" in response.headers
+        or "last-modified" in response.headers
+    )
+
+
+def _is_cacheable_request(client, method: str, url: str, headers: Dict[str, str], params) -> bool:
+    """Only anonymous GETs use the shared cache; client defaults and cookies count too."""
+    if method.upper() != "GET":
+        return False
+    request = client.build_request(method, url, headers=headers, params=params)
+    if client.auth is not None or any(name in request.headers for name in _CREDENTIAL_HEADERS):
+        cache_stats["bypassed"] += 1
+        return False
+    return True
+
+
+class HTTPCache:
+    """
+    On-disk cache for GET responses shared by the fetch and scrape tasks.
+
+    Honours Cache-Control/Expires freshness, revalidates stale entries with
+    If-None-Match/If-Modified-Since, and evicts least recently used entries
+    once the stored bodies exceed `max_bytes`. Requests carrying
+    Authorization or Cookie headers bypass the cache entirely.
+    """
+
+    def __init__(self, directory: str = HTTP_CACHE_DIR, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        base = os.path.join(self.directory, key)
+        return f"{base}.json", f"{base}.body"
+
+    def _load(self, url: str):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, json.JSONDecodeError):
+            return None, None
+        # Access time drives LRU eviction
+        os.utime(meta_path)
+        return meta, body
+
+    def _store(self, url: str, meta: Dict[str, Any], body: Optional[bytes] = None) -> None:
+        meta_path, body_path = self._paths(url)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if body is not None:
+                with open(f"{body_path}.tmp", 'wb') as f:
+                    f.write(body)
+                os.replace(f"{body_path}.tmp", body_path)
+            with open(f"{meta_path}.tmp", 'w') as f:
+                json.dump(meta, f)
+            os.replace(f"{meta_path}.tmp", meta_path)
+        except OSError as e:
+            print(f"Could not write HTTP cache entry for {url}: {e}")
+            return
+        if body is not None:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    if entry.name.endswith(".json"):
+                        meta_stat = entry.stat()
+                        body_path = entry.path[:-len(".json")] + ".body"
+                        size = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+                        entries.append((meta_stat.st_mtime, entry.path, body_path, size))
+                        total += size
+        except OSError:
+            return
+
+        for _, meta_path, body_path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in (meta_path, body_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+
+    @staticmethod
+    def _to_response(request: httpx.Request, meta: Dict[str, Any], body: bytes) -> httpx.Response:
+        return httpx.Response(
+            meta["status_code"],
+            headers=meta["headers"],
+            content=body,
+            request=request
+        )
+
+    def _lookup(self, client, method: str, url: str, headers: Dict[str, str], params):
+        """
+        Find the stored entry for a request. Returns the built request, the
+        cache key URL, the entry, and a response when the entry is still fresh.
+        Stale entries add conditional validators to `headers`.
+        """
+        request = client.build_request(method, url, headers=headers, params=params)
+        cache_url = str(request.url)
+        meta, body = self._load(cache_url)
+
+        if meta is not None:
+            age = time.time() - meta["stored_at"]
+            if age < _freshness_lifetime(meta["headers"]):
+                cache_stats["hits"] += 1
+                return request, cache_url, meta, body, self._to_response(request, meta, body)
+            if "etag" in meta["headers"]:
+                headers["If-None-Match"] = meta["headers"]["etag"]
+            if "last-modified" in meta["headers"]:
+                headers["If-Modified-Since"] = meta["headers"]["last-modified"]
+        return request, cache_url, meta, body, None
+
+    def _complete(self, request, cache_url, meta, body, headers, response) -> httpx.Response:
+        """Store or refresh the entry from a network response and return the result."""
+        if meta is not None and response.status_code == 304:
+            # Unchanged upstream: refresh the stored headers and reuse the body
+            cache_stats["revalidated"] += 1
+            meta["headers"].update({
+                name: value for name, value in response.headers.items()
+                if name.lower() not in _DROPPED_HEADERS
+            })
+            meta["stored_at"] = time.time()
+            self._store(cache_url, meta)
+            return self._to_response(request, meta, body)
+
+        cache_stats["misses"] += 1
+        if _is_storable(response, headers):
+            self._store(cache_url, {
+                "url": cache_url,
+                "status_code": response.status_code,
+                "headers": {
+                    name: value for name, value in response.headers.items()
+                    if name.lower() not in _DROPPED_HEADERS
+                },
+                "stored_at": time.time()
+            }, response.content)
+        return response
+
+    def request(
+        self,
+        client: httpx.Client,
+        method: str,
+        url: str,
+        send: Optional[Callable[..., httpx.Response]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request through the cache. `send(method, url, headers=...,
+        params=..., **kwargs)` performs the network call and defaults to
+        `client.request`; only GET requests without credentials are cached.
+        """
+        send = send or client.request
+        headers = dict(headers or {})
+        if not _is_cacheable_request(client, method, url, headers, params):
+            return send(method, url, headers=headers, params=params, **kwargs)
+
+        request, cache_url, meta, body, fresh = self._lookup(client, method, url, headers, params)
+        if fresh is not None:
+            return fresh
+        response = send(method, url, headers=headers, params=params, **kwargs)
+        return self._complete(request, cache_url, meta, body, headers, response)
+
+    async def arequest(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Async counterpart of `request` for the shared AsyncClient. Cache file
+        reads, writes and eviction run on the task thread pool.
+        """
+        headers = dict(headers or {})
+        if not _is_cacheable_request(client, method, url, headers, params):
+            return await client.request(method, url, headers=headers, params=params, **kwargs)
+
+        request, cache_url, meta, body, fresh = await run_in_thread(
+            self._lookup, client, method, url, headers, params
+        )
+        if fresh is not None:
+            return fresh
+        response = await client.request(method, url, headers=headers, params=params, **kwargs)
+        return await run_in_thread(self._complete, request, cache_url, meta, body, headers, response)
+
+
+http_cache = HTTPCache()
@@ -0,0 +1,58 @@
+import importlib.util
+import os
+from typing import Optional
+
+import httpx
+
+# HTTP/2 needs `h2`, declared through httpx[http2]; environments without it fall back to HTTP/1.1 keep-alive
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+HTTP_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+    max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", "20")),
+    keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+)
+HTTP_TIMEOUT = httpx.Timeout(float(os.getenv("HTTP_TIMEOUT", "60")), connect=10.0)
+
+_async_client: Optional[httpx.AsyncClient] = None
+_sync_client: Optional[httpx.Client] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide pooled async client used for LLM and outbound calls.
+
+    The client is normally created by the FastAPI lifespan; it is created lazily
+    here as well so handlers keep working when called outside the app.
+    """
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED,
+            limits=HTTP_LIMITS,
+            timeout=HTTP_TIMEOUT
+        )
+    return _async_client
+
+
+def get_sync_http_client() -> httpx.Client:
+    """Return the process-wide pooled client for synchronous handlers."""
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        _sync_client = httpx.Client(
+            http2=HTTP2_ENABLED,
+            limits=HTTP_LIMITS,
+            timeout=HTTP_TIMEOUT
+        )
+    return _sync_client
+
+
+async def close_http_clients() -> None:
+    """Close the shared clients, releasing pooled connections."""
+    global _async_client, _sync_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
@@ -0,0 +1,141 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "64"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# Finished jobs stay pollable for this many seconds
+JOB_RETENTION = float(os.getenv("JOB_RETENTION", "3600"))
+
+
+class JobQueueFull(Exception):
+    """Raised by `submit` when the queue is at capacity."""
+
+
+class JobQueue:
+    """
+    Bounded in-process job queue drained by a fixed pool of worker tasks.
+
+    `execute(task_description)` is awaited for every job. Job records are
+    plain dicts with id, status (queued, running, succeeded, failed), result
+    and error, plus timestamps.
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[str], Awaitable[Any]],
+        max_size: int = JOB_QUEUE_SIZE,
+        workers: int = JOB_WORKERS,
+        retention: float = JOB_RETENTION
+    ):
+        self.execute = execute
+        self.max_size = max_size
+        self.num_workers = max(1, workers)
+        self.retention = retention
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._done: Dict[str, asyncio.Event] = {}
+
+    def start(self) -> None:
+        """Create the queue and workers; must be called from the running event loop."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{index}")
+            for index in range(self.num_workers)
+        ]
+
+    async def stop(self) -> None:
+        """
+        Cancel the workers and fail every job still queued or running, so
+        pollers and waiters get an answer; the next `start` begins empty.
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        for job_id, job in self._jobs.items():
+            if job["status"] in ("queued", "running"):
+                job["status"] = "failed"
+                job["error"] = "Job queue stopped before the job finished"
+                job["finished_at"] = time.time()
+        for event in self._done.values():
+            event.set()
+        self._done.clear()
+
+    def submit(self, task_description: str) -> Dict[str, Any]:
+        """Queue a task and return its job record, or raise JobQueueFull."""
+        self.start()
+        self._prune()
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "task": task_description,
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None
+        }
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            raise JobQueueFull(f"Job queue is full ({self.max_size} jobs waiting)")
+        self._jobs[job_id] = job
+        self._done[job_id] = asyncio.Event()
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Dict[str, Any]:
+        """Wait up to `timeout` seconds for a job to finish and return its record."""
+        event = self._done.get(job_id)
+        if event is not None and timeout > 0:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self._jobs[job_id]
+
+    def stats(self) -> Dict[str, Any]:
+        counts = {"queued": 0, "running": 0, "succeeded": 0, "failed": 0}
+        for job in self._jobs.values():
+            counts[job["status"]] += 1
+        return {**counts, "max_size": self.max_size, "workers": self.num_workers}
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs[job_id]
+            job["status"] = "running"
+            job["started_at"] = time.time()
+            try:
+                job["result"] = await self.execute(job["task"])
+                job["status"] = "succeeded"
+            except asyncio.CancelledError:
+                # stop() fails the job and wakes its waiters
+                raise
+            except Exception as e:
+                job["error"] = str(e)
+                job["status"] = "failed"
+            job["finished_at"] = time.time()
+            self._done.pop(job_id).set()
+            self._queue.task_done()
+
+    def _prune(self) -> None:
+        # Jobs are kept in submission order, so expired ones are found from the front
+        cutoff = time.time() - self.retention
+        for job_id in list(self._jobs):
+            job = self._jobs[job_id]
+            if job["finished_at"] is not None and job["finished_at"] < cutoff:
+                del self._jobs[job_id]
+            elif job["created_at"] >= cutoff:
+                break
@@ -0,0 +1,67 @@
+import json
+import os
+import re
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# "stdlib" (the default) parses and writes with the json module; "orjson" opts in
+# to orjson, when installed, for parsing and compact output. orjson rejects
+# NaN/Infinity and reads integers wider than 64 bits as floats, so those inputs
+# still go through the stdlib. Pretty output always comes from the stdlib so
+# files stay byte-identical to json.dump(indent=2): orjson writes raw UTF-8 and
+# formats floats differently.
+JSON_BACKEND = os.getenv("JSON_BACKEND", "stdlib")
+JSON_PRETTY = os.getenv("JSON_PRETTY", "true").lower() != "false"
+
+# 19+ digits may not fit in 64 bits; such input is parsed by the stdlib
+LONG_NUMBER_RE = re.compile(rb"\d{19}")
+
+
+def _use_orjson() -> bool:
+    return orjson is not None and JSON_BACKEND == "orjson"
+
+
+def dumps_json(obj: Any, pretty: Optional[bool] = None) -> bytes:
+    """
+    Serialize to bytes: exactly json.dumps(obj, indent=2) when pretty, else
+    compact (orjson when available, which leaves non-ASCII as raw UTF-8).
+    """
+    if pretty is None:
+        pretty = JSON_PRETTY
+    if not pretty and _use_orjson():
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, which only the stdlib handles
+            pass
+    if pretty:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def dump_json(obj: Any, file_path: str, pretty: Optional[bool] = None) -> None:
+    """Write `obj` as JSON straight to `file_path` as bytes."""
+    with open(file_path, 'wb') as f:
+        f.write(dumps_json(obj, pretty))
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """Parse JSON text exactly as json.loads would; errors are json.JSONDecodeError."""
+    if _use_orjson():
+        raw = data.encode() if isinstance(data, str) else data
+        if not LONG_NUMBER_RE.search(raw):
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # NaN/Infinity literals and out-of-range floats; the stdlib decides
+                pass
+    return json.loads(data)
+
+
+def load_json(file_path: str) -> Any:
+    with open(file_path, 'rb') as f:
+        return loads_json(f.read())
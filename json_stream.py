@@ -0,0 +1,109 @@
+import json
+from typing import Any, IO, Iterable, Iterator
+
+JSON_READ_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+
+# A number cut at ".", "e" or "e-" leaves at most this many characters undecoded
+_SCALAR_LOOKAHEAD = 3
+
+
+def iter_json_array(file: IO[str], chunk_size: int = JSON_READ_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    Only the element being decoded is held in memory. Raises ValueError when
+    the document is not an array and json.JSONDecodeError when it is malformed.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        # Drop consumed text so the buffer never grows with the file
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    def skip_whitespace() -> str:
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not fill():
+                return ""
+
+    if skip_whitespace() != "[":
+        raise ValueError("Input file must contain an array of contacts")
+    position += 1
+
+    if skip_whitespace() == "]":
+        return
+
+    while True:
+        skip_whitespace()
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+            # A scalar near the end of the buffer may be cut short, e.g. "1." or
+            # "2e-" decodes as just the integer part, so read on before accepting it
+            if len(buffer) - end < _SCALAR_LOOKAHEAD and not isinstance(item, (dict, list)) \
+                    and not eof and fill():
+                continue
+        except json.JSONDecodeError:
+            if eof or not fill():
+                raise
+            continue
+        position = end
+        yield item
+
+        separator = skip_whitespace()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+        position += 1
+
+
+class JSONArrayWriter:
+    """
+    Incremental JSON array writer laid out exactly like json.dump(items, indent=indent).
+
+    Call `write` per element and `finish` once at the end.
+    """
+
+    def __init__(self, file: IO[str], indent: int = 2):
+        self.file = file
+        self.indent = indent
+        self.prefix = " " * indent
+        self.count = 0
+
+    def write(self, item: Any) -> None:
+        self.file.write("[\n" if self.count == 0 else ",\n")
+        encoded = json.dumps(item, indent=self.indent)
+        self.file.write(self.prefix + encoded.replace("\n", "\n" + self.prefix))
+        self.count += 1
+
+    def finish(self) -> None:
+        self.file.write("\n]" if self.count else "[]")
+
+
+def write_json_array(file: IO[str], items: Iterable[Any], indent: int = 2) -> int:
+    """
+    Write items as a JSON array incrementally and return how many were written.
+
+    The output is identical to `json.dump(list(items), file, indent=indent)`.
+    """
+    writer = JSONArrayWriter(file, indent)
+    for item in items:
+        writer.write(item)
+    writer.finish()
+    return writer.count
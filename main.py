@@ -1,11 +1,14 @@
 from typing import Dict, Any
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
 from openai import OpenAI
 from pathlib import Path
+import asyncio
+import inspect
 import json
 import os
-import httpx
 
 from custom_function import custom_function
 from run_datagen import run_datagen
@@ -18,7 +21,34 @@ from task_fetch_data_from_api import task_fetch_data_from_api
 from task_extract_data_from_website import task_extract_data_from_website
 from run_extract_on_email import run_extract_on_email
 from run_extract_card_number import run_extract_card_number
-app = FastAPI()
+from plan_cache import PlanCache, normalize_task
+from http_client import get_http_client, close_http_clients
+from task_runner import run_handler, shutdown_task_runner
+from task_router import route_task, router_stats
+from file_readers import shutdown_file_readers
+from job_queue import JobQueue, JobQueueFull
+from plan_executor import MULTI_STEP_FUNCTION, execute_plan, plan_as_step, steps_conflict
+
+# "sync" answers /run in the request; "async" queues it and returns a job id
+RUN_MODE = os.getenv("RUN_MODE", "sync")
+BATCH_MAX_TASKS = int(os.getenv("BATCH_MAX_TASKS", "1000"))
+# Caps concurrent plan lookups so a large batch does not flood the LLM proxy
+BATCH_PLAN_CONCURRENCY = int(os.getenv("BATCH_PLAN_CONCURRENCY", "8"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client for the whole app so calls reuse TCP+TLS connections
+    get_http_client()
+    job_queue.start()
+    yield
+    await job_queue.stop()
+    await close_http_clients()
+    shutdown_task_runner()
+    shutdown_file_readers()
+
+app = FastAPI(lifespan=lifespan)
+plan_cache = PlanCache()
 
 async def parse_task(task_description: str) -> Dict[str, Any]:
     """Parse task description into structured JSON plan using GPT-4."""
@@ -37,14 +67,14 @@ async def parse_task(task_description: str) -> Dict[str, Any]:
         "function_call": "auto"
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://aiproxy.sanand.workers.dev/openai/v1/chat/completions",
-            headers=headers,
-            json=payload
-        )
-        response.raise_for_status()
-        data = response.json()
+    client = get_http_client()
+    response = await client.post(
+        "https://aiproxy.sanand.workers.dev/openai/v1/chat/completions",
+        headers=headers,
+        json=payload
+    )
+    response.raise_for_status()
+    data = response.json()
     
     response_message = data["choices"][0]["message"]
     
@@ -57,6 +87,20 @@ async def parse_task(task_description: str) -> Dict[str, Any]:
     }
     return response_dict
 
+async def get_plan(task_description: str) -> Dict[str, Any]:
+    """
+    Resolve a task to a plan: rule-based router first, then the plan cache,
+    and only then a `parse_task` LLM round-trip.
+    """
+    plan = route_task(task_description)
+    if plan is not None:
+        return plan
+    plan = plan_cache.get(task_description)
+    if plan is None:
+        plan = await parse_task(task_description)
+        plan_cache.put(task_description, plan)
+    return plan
+
 async def call_task(task_object: Dict[str,Any]):
     # T-35 Implement plan execution logic
     # Which function call was invoked
@@ -64,6 +108,10 @@ async def call_task(task_object: Dict[str,Any]):
     function_args = task_object[function_called]
 
     print(function_args)
+    if function_called == MULTI_STEP_FUNCTION:
+        # Each step is an ordinary single-function plan run back through call_task
+        return await execute_plan(function_args["steps"], call_task)
+
     # Function names need to finish run_datagen
     available_functions = {
         "run_datagen": run_datagen,
@@ -78,10 +126,20 @@ async def call_task(task_object: Dict[str,Any]):
         "run_extract_card_number": run_extract_card_number
     }
     
+    if function_called not in available_functions:
+        raise ValueError(f"Unknown function: {function_called}")
     function_to_call = available_functions[function_called]
 
+    # Arguments bind by name: LLM plans list them in no particular order, and
+    # unknown or missing names fail here rather than binding to the wrong parameter
+    try:
+        inspect.signature(function_to_call).bind(**function_args)
+    except TypeError as e:
+        raise ValueError(f"Invalid arguments for {function_called}: {e}")
+
     print("\033[91m", function_to_call, "\033[0m")  # Print in red using ANSI escape codes
-    task_response = await function_to_call(*list(function_args.values()))
+    # Sync handlers run on the task thread pool so they never block the event loop
+    task_response = await run_handler(function_called, function_to_call, **function_args)
     # Extracting the arguments
     # function_args  = json.loads(response_message.function_call.arguments)
     
@@ -90,28 +148,155 @@ async def call_task(task_object: Dict[str,Any]):
     return task_response
 
 
+async def execute_task(task_description: str):
+    """Plan and run one task; shared by synchronous /run and queued jobs."""
+    plan = await get_plan(task_description)
+    print(plan)
+    return await call_task(plan)
+
+
+job_queue = JobQueue(execute_task)
+
+
 @app.get("/")
 async def root() -> Dict[str, str]:
     """Root endpoint returning a welcome message."""
     return {"message": "Hello from tds-2025-01-project1!"}
 
 
+@app.get("/plan-cache")
+async def plan_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters for the `parse_task` plan cache and the rule router."""
+    return {**plan_cache.stats(), "router": router_stats}
+
+
 @app.post("/run")
 async def run_task(request: Request) -> Response:
-    """Execute a task based on the provided description."""
+    """
+    Execute a task based on the provided description.
+
+    With `mode=async` the task is queued and a job id is returned (202) for
+    polling at /jobs/{id}; `wait=<seconds>` still answers inline if the job
+    finishes in time. A full queue is rejected with 429.
+    """
     task = request.query_params.get('task')
     if not task:
         return Response(content="Task is required", status_code=400)
-    
+
+    mode = request.query_params.get('mode', RUN_MODE)
+    if mode == "async":
+        try:
+            wait = float(request.query_params.get('wait', 0))
+        except ValueError:
+            return Response(content="wait must be a number of seconds", status_code=400)
+        try:
+            job = job_queue.submit(task)
+        except JobQueueFull as e:
+            return Response(content=str(e), status_code=429, headers={"Retry-After": "5"})
+
+        job = await job_queue.wait(job["id"], wait)
+        if job["status"] == "succeeded":
+            return Response(content=json.dumps(job["result"]), status_code=200)
+        if job["status"] == "failed":
+            return Response(content=f"Task parsing failed: {job['error']}", status_code=400)
+        return Response(
+            content=json.dumps({"job_id": job["id"], "status": job["status"], "url": f"/jobs/{job['id']}"}),
+            status_code=202,
+            media_type="application/json"
+        )
+
     try:
-        plan = await parse_task(task)
-        print(plan)
-        action_response = await call_task(plan)
+        action_response = await execute_task(task)
         print(action_response)
         return Response(content=json.dumps(action_response), status_code=200)
     except Exception as e:
         return Response(content=f"Task parsing failed: {str(e)}", status_code=400)
-    
+
+
+@app.post("/run/batch")
+async def run_batch(request: Request) -> Response:
+    """
+    Execute many tasks in one request.
+
+    The body is a JSON list of task strings (or {"tasks": [...]}). Identical
+    tasks run once and plans are resolved concurrently under
+    BATCH_PLAN_CONCURRENCY. Independent tasks run in parallel; a task that
+    reads or writes files an earlier task touches waits for it. One NDJSON
+    line per submitted task is streamed back as soon as its task completes.
+    """
+    try:
+        body = await request.json()
+    except ValueError:
+        return Response(content="Body must be a JSON list of tasks", status_code=400)
+    tasks = body.get("tasks") if isinstance(body, dict) else body
+    if not isinstance(tasks, list) or not all(isinstance(task, str) and task for task in tasks):
+        return Response(content="Body must be a JSON list of tasks", status_code=400)
+    if len(tasks) > BATCH_MAX_TASKS:
+        return Response(content=f"At most {BATCH_MAX_TASKS} tasks per batch", status_code=413)
+
+    # Map each distinct task to every position it was submitted at
+    positions: Dict[str, list] = {}
+    for index, task in enumerate(tasks):
+        positions.setdefault(normalize_task(task), []).append(index)
+    keys = list(positions)
+
+    plan_semaphore = asyncio.Semaphore(max(1, BATCH_PLAN_CONCURRENCY))
+
+    async def resolve_plan(key: str):
+        async with plan_semaphore:
+            return await get_plan(tasks[positions[key][0]])
+
+    async def run_one(position: int, key: str):
+        try:
+            plan = await plans[position]
+            # Tasks touching the same files run in submission order, e.g. A1's
+            # datagen finishes before later tasks read what it wrote into /data
+            step = plan_as_step(key, plan)
+            for earlier in range(position):
+                try:
+                    earlier_plan = await plans[earlier]
+                except Exception:
+                    continue
+                if steps_conflict(plan_as_step(keys[earlier], earlier_plan), step):
+                    await asyncio.wait([runs[earlier]])
+            # Execution is bounded by the per-task-type semaphores in run_handler
+            return key, {"status": "success", "result": await call_task(plan)}
+        except Exception as e:
+            return key, {"status": "error", "error": f"Task parsing failed: {str(e)}"}
+
+    plans: list = []
+    runs: list = []
+
+    async def stream_results():
+        plans.extend(asyncio.create_task(resolve_plan(key)) for key in keys)
+        runs.extend(asyncio.create_task(run_one(position, key)) for position, key in enumerate(keys))
+        try:
+            for finished in asyncio.as_completed(runs):
+                key, outcome = await finished
+                for index in positions[key]:
+                    yield json.dumps({"index": index, "task": tasks[index], **outcome}) + "\n"
+        finally:
+            # Client went away mid-stream: stop the remaining work
+            for task in plans + runs:
+                task.cancel()
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> Response:
+    """Return the status, and once finished the result or error, of a queued job."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return Response(content="Job not found", status_code=404)
+    return Response(content=json.dumps(job), status_code=200, media_type="application/json")
+
+
+@app.get("/jobs")
+async def job_stats() -> Dict[str, Any]:
+    """Return job counts by status and the queue limits."""
+    return job_queue.stats()
+
 @app.get("/read")
 async def read_file(path: str = None) -> Response:
     """Read and return contents of specified file from data directory."""
@@ -0,0 +1,119 @@
+import csv
+import os
+from typing import Any, Dict, List, Optional
+
+from json_backend import dumps_json
+from json_stream import JSONArrayWriter
+
+SINK_FLUSH_ROWS = int(os.getenv("SINK_FLUSH_ROWS", "100"))
+
+JSON_LINES_FORMATS = ("jsonl", "ndjson", "json lines")
+
+
+class OutputSink:
+    """
+    Incremental record writer. Records are written as they arrive and the
+    file is flushed every `flush_rows` records, so memory stays flat and a
+    crash leaves every flushed record on disk.
+    """
+
+    def __init__(self, file_path: str, flush_rows: int = SINK_FLUSH_ROWS, binary: bool = False):
+        self.file_path = file_path
+        self.flush_rows = max(1, flush_rows)
+        self.count = 0
+        if binary:
+            self.file = open(file_path, 'wb')
+        else:
+            self.file = open(file_path, 'w', newline='', encoding='utf-8')
+
+    def write(self, record: Any) -> None:
+        self._write_record(record)
+        self.count += 1
+        if self.count % self.flush_rows == 0:
+            self.file.flush()
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self._finish()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write_record(self, record: Any) -> None:
+        raise NotImplementedError
+
+    def _finish(self) -> None:
+        pass
+
+
+class JSONSink(OutputSink):
+    """A single JSON array, laid out exactly like json.dump(records, indent=2)."""
+
+    def __init__(self, file_path: str, flush_rows: int = SINK_FLUSH_ROWS, indent: int = 2):
+        super().__init__(file_path, flush_rows)
+        self.array_writer = JSONArrayWriter(self.file, indent)
+
+    def _write_record(self, record: Any) -> None:
+        self.array_writer.write(record)
+
+    def _finish(self) -> None:
+        self.array_writer.finish()
+
+
+class JSONLinesSink(OutputSink):
+    """One compact JSON document per line; every flushed line is valid on its own."""
+
+    def __init__(self, file_path: str, flush_rows: int = SINK_FLUSH_ROWS):
+        super().__init__(file_path, flush_rows, binary=True)
+
+    def _write_record(self, record: Any) -> None:
+        self.file.write(dumps_json(record, pretty=False))
+        self.file.write(b"\n")
+
+
+class CSVSink(OutputSink):
+    """
+    CSV with one column per field. A record whose values are lists expands
+    into one row per list index, so the Nth matches of each field line up.
+    """
+
+    def __init__(self, file_path: str, columns: List[str], flush_rows: int = SINK_FLUSH_ROWS):
+        super().__init__(file_path, flush_rows)
+        self.columns = columns
+        self.writer = csv.DictWriter(self.file, fieldnames=columns, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def _write_record(self, record: Dict[str, Any]) -> None:
+        lists = [record.get(column) for column in self.columns if isinstance(record.get(column), list)]
+        num_rows = max([len(values) for values in lists] + [1])
+        for index in range(num_rows):
+            row = {}
+            for column in self.columns:
+                value = record.get(column, "")
+                if isinstance(value, list):
+                    value = value[index] if index < len(value) else ""
+                row[column] = value
+            self.writer.writerow(row)
+
+
+def open_sink(
+    file_path: str,
+    data_format: str,
+    columns: Optional[List[str]] = None,
+    flush_rows: int = SINK_FLUSH_ROWS
+) -> OutputSink:
+    """Open a sink for 'json', 'jsonl' (also 'ndjson') or 'csv' output."""
+    data_format = data_format.lower()
+    if data_format == "json":
+        return JSONSink(file_path, flush_rows)
+    if data_format in JSON_LINES_FORMATS:
+        return JSONLinesSink(file_path, flush_rows)
+    if data_format == "csv":
+        if not columns:
+            raise ValueError("CSV output needs column names")
+        return CSVSink(file_path, columns, flush_rows)
+    raise ValueError(f"Unsupported output format: {data_format}")
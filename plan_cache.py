@@ -0,0 +1,124 @@
+import copy
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+PLAN_CACHE_PATH = os.getenv("PLAN_CACHE_PATH", ".cache/plan_cache.json")
+PLAN_CACHE_SIZE = int(os.getenv("PLAN_CACHE_SIZE", "1024"))
+PLAN_CACHE_TTL = float(os.getenv("PLAN_CACHE_TTL", "86400"))
+
+
+def normalize_task(task_description: str) -> str:
+    """
+    Normalize a task string so trivially different spellings share a cache entry.
+
+    Whitespace is collapsed and unicode is NFKC-normalized. Case is kept because
+    file paths and email addresses inside the task are case sensitive.
+    """
+    text = unicodedata.normalize("NFKC", task_description)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class PlanCache:
+    """
+    Bounded LRU cache with TTL mapping normalized task text to the
+    `{function_name: args}` plan returned by `parse_task`.
+
+    Entries are persisted to a JSON file so the cache survives restarts.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = PLAN_CACHE_PATH,
+        max_size: int = PLAN_CACHE_SIZE,
+        ttl: float = PLAN_CACHE_TTL
+    ):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.load()
+
+    def get(self, task_description: str) -> Optional[Dict[str, Any]]:
+        key = normalize_task(task_description)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._is_expired(entry):
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry["plan"])
+
+    def put(self, task_description: str, plan: Dict[str, Any]) -> None:
+        key = normalize_task(task_description)
+        with self._lock:
+            self._entries[key] = {"plan": copy.deepcopy(plan), "stored_at": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self._save()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl
+            }
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Ignoring unreadable plan cache {self.path}: {e}")
+            return
+
+        # Entries are stored oldest first so LRU order is restored as-is
+        for key, entry in stored.items():
+            if not self._is_expired(entry):
+                self._entries[key] = entry
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Write to a temp file first so a crash never leaves a truncated cache
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not persist plan cache to {self.path}: {e}")
+
+    def _is_expired(self, entry: Dict[str, Any]) -> bool:
+        return self.ttl > 0 and time.time() - entry["stored_at"] > self.ttl
@@ -0,0 +1,199 @@
+import asyncio
+import os
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Set
+
+# Function name parse_task returns for a plan made of several calls
+MULTI_STEP_FUNCTION = "run_multi_step_plan"
+
+# Arguments naming files a step writes; every other string argument may be read
+OUTPUT_ARGUMENTS = {"output_file_path", "output_file", "output_dir", "output_directory"}
+
+# "${step_id.field}" inside an argument is replaced by that field of the step's result
+STEP_REFERENCE_RE = re.compile(r"\$\{([\w-]+)\.([\w-]+)\}")
+
+
+def _strings(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [item for element in value for item in _strings(element)]
+    if isinstance(value, dict):
+        return [item for element in value.values() for item in _strings(element)]
+    return []
+
+
+# Arguments naming files a function rewrites in place
+IN_PLACE_ARGUMENTS = {"run_prettier_format": {"file_path"}}
+
+# Files a function writes without naming them in its arguments
+IMPLICIT_WRITES = {"run_datagen": {"/data"}}
+
+
+def _paths(arguments: Dict[str, Any], outputs: bool, written=frozenset()) -> Set[str]:
+    return {
+        os.path.normpath(value)
+        for name, argument in arguments.items()
+        if (name in OUTPUT_ARGUMENTS or name in written) == outputs
+        for value in _strings(argument)
+        if "/" in value
+    }
+
+
+def _file_access(step: Dict[str, Any]):
+    """Return the (reads, writes) path sets of a step, looking inside nested multi-step plans."""
+    function = step.get("function")
+    arguments = step.get("arguments", {})
+    if function == MULTI_STEP_FUNCTION:
+        reads, writes = set(), set()
+        for inner in arguments.get("steps", []):
+            inner_reads, inner_writes = _file_access(inner)
+            reads |= inner_reads
+            writes |= inner_writes
+        return reads, writes
+    written = IN_PLACE_ARGUMENTS.get(function, frozenset())
+    writes = _paths(arguments, True, written) | IMPLICIT_WRITES.get(function, set())
+    return _paths(arguments, False, written), writes
+
+
+def _overlaps(paths: Set[str], others: Set[str]) -> bool:
+    # A directory overlaps every path beneath it
+    return any(
+        path == other or path.startswith(other.rstrip("/") + "/") or other.startswith(path.rstrip("/") + "/")
+        for path in paths for other in others
+    )
+
+
+def steps_conflict(earlier: Dict[str, Any], later: Dict[str, Any]) -> bool:
+    """
+    True when `later` must wait for `earlier`: it reads or overwrites a path
+    `earlier` writes, or writes a path `earlier` reads.
+    """
+    earlier_reads, earlier_writes = _file_access(earlier)
+    reads, writes = _file_access(later)
+    return _overlaps(earlier_writes, reads | writes) or _overlaps(earlier_reads, writes)
+
+
+def plan_as_step(step_id: str, plan: Dict[str, Any]) -> Dict[str, Any]:
+    """View a `{function: arguments}` plan as a step so whole plans can be ordered too."""
+    function, arguments = next(iter(plan.items()))
+    return {"id": step_id, "function": function, "arguments": arguments}
+
+
+def build_step_graph(steps: List[Dict[str, Any]]) -> Dict[str, Set[str]]:
+    """
+    Map each step id to the ids it must wait for.
+
+    Dependencies are the explicit `depends_on` list, any `${id.field}`
+    references, and file hazards with earlier steps: reading or overwriting
+    a path an earlier step writes, or writing a path an earlier step reads.
+    Raises ValueError for duplicate or unknown ids and for cycles.
+    """
+    ids = [step["id"] for step in steps]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Plan step ids must be unique")
+
+    graph: Dict[str, Set[str]] = {}
+    for position, step in enumerate(steps):
+        arguments = step.get("arguments", {})
+        depends = set(step.get("depends_on", []))
+        depends.update(match.group(1) for value in _strings(arguments) for match in STEP_REFERENCE_RE.finditer(value))
+
+        for earlier in steps[:position]:
+            if steps_conflict(earlier, step):
+                depends.add(earlier["id"])
+
+        unknown = depends - set(ids)
+        if unknown:
+            raise ValueError(f"Step {step['id']} depends on unknown steps: {sorted(unknown)}")
+        graph[step["id"]] = depends
+
+    # Depth-first search for cycles, which only explicit depends_on can create
+    state: Dict[str, str] = {}
+
+    def visit(step_id: str) -> None:
+        state[step_id] = "visiting"
+        for dependency in graph[step_id]:
+            if state.get(dependency) == "visiting":
+                raise ValueError(f"Plan has a dependency cycle through step {dependency}")
+            if dependency not in state:
+                visit(dependency)
+        state[step_id] = "done"
+
+    for step_id in ids:
+        if step_id not in state:
+            visit(step_id)
+    return graph
+
+
+def resolve_arguments(arguments: Any, results: Dict[str, Any]) -> Any:
+    """Substitute `${id.field}` references with values from finished steps' results."""
+    if isinstance(arguments, dict):
+        return {name: resolve_arguments(value, results) for name, value in arguments.items()}
+    if isinstance(arguments, list):
+        return [resolve_arguments(value, results) for value in arguments]
+    if not isinstance(arguments, str):
+        return arguments
+
+    def lookup(match):
+        step_id, field = match.groups()
+        result = results.get(step_id)
+        if not isinstance(result, dict) or field not in result:
+            raise ValueError(f"Step {step_id} has no result field {field}")
+        return result[field]
+
+    whole = STEP_REFERENCE_RE.fullmatch(arguments)
+    if whole:
+        # A lone reference keeps the value's type, e.g. a list of records
+        return lookup(whole)
+    return STEP_REFERENCE_RE.sub(lambda match: str(lookup(match)), arguments)
+
+
+async def execute_plan(
+    steps: List[Dict[str, Any]],
+    run_step: Callable[[Dict[str, Any]], Awaitable[Any]]
+) -> Dict[str, Any]:
+    """
+    Run a multi-step plan, starting every step as soon as its dependencies
+    finish so independent steps run concurrently.
+
+    Each step is {"id", "function", "arguments", "depends_on"?}; `run_step`
+    receives the usual single-call plan `{function: arguments}`. Results stay
+    in memory for later references. A step whose dependency failed is skipped.
+    """
+    # Plans from the LLM may omit ids or use numbers; steps default to their 1-based position
+    steps = [
+        {
+            **step,
+            "id": str(step.get("id", position + 1)),
+            "depends_on": [str(dependency) for dependency in step.get("depends_on", [])]
+        }
+        for position, step in enumerate(steps)
+    ]
+    graph = build_step_graph(steps)
+    results: Dict[str, Any] = {}
+    runs: Dict[str, asyncio.Task] = {}
+
+    async def run(step: Dict[str, Any]) -> bool:
+        dependencies_ok = await asyncio.gather(*(runs[dependency] for dependency in graph[step["id"]]))
+        if not all(dependencies_ok):
+            results[step["id"]] = {"status": "skipped", "message": "A step it depends on failed"}
+            return False
+        try:
+            arguments = resolve_arguments(step.get("arguments", {}), results)
+            result = await run_step({step["function"]: arguments})
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+        results[step["id"]] = result
+        return not (isinstance(result, dict) and result.get("status") == "error")
+
+    # Tasks only start once this loop yields, so every step finds its dependencies' tasks
+    for step in steps:
+        runs[step["id"]] = asyncio.ensure_future(run(step))
+    outcomes = await asyncio.gather(*runs.values())
+
+    return {
+        "status": "success" if all(outcomes) else "error",
+        "message": f"{sum(outcomes)} of {len(steps)} steps succeeded",
+        "steps": {step["id"]: results[step["id"]] for step in steps}
+    }
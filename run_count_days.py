@@ -1,7 +1,9 @@
-import pandas as pd
 import os
-from datetime import datetime
-import dateparser
+import calendar
+
+from date_parsing import DateParseError
+from weekday_index import get_weekday_counts
+from task_runner import run_in_thread
 
 async def run_count_days(input_file_path, weekday_to_count, output_file_path = None):
     """
@@ -19,33 +21,24 @@ async def run_count_days(input_file_path, weekday_to_count, output_file_path = N
                 "message": f"Input file not found at: {input_file_path}"
             }
 
-        # Read the txt file and process dates
-        with open("../" + input_file_path, 'r') as file:
-            lines = [line.strip() for line in file.readlines()]
-        
-        # Use dateparser for flexible date parsing
-        parsed_dates = []
-        for date_str in lines:
-            try:
-                parsed_date = dateparser.parse(date_str)
-                if parsed_date:
-                    parsed_dates.append(parsed_date)
-                else:
-                    return {
-                        "status": "error",
-                        "message": f"Could not parse date: {date_str}"
-                    }
-            except Exception as e:
-                return {
-                    "status": "error",
-                    "message": f"Error parsing date {date_str}: {str(e)}"
-                }
-        
-        # Create DataFrame with parsed dates
-        df = pd.DataFrame(parsed_dates, columns=['date'])
-        
-        # Get day name and count occurrences of specified weekday
-        weekday_counts = df[df['date'].dt.day_name() == weekday_to_count.capitalize()].shape[0]
+        # Reuse the cached weekday histogram unless the file changed since last scan;
+        # a full parse is CPU bound, so it runs on the task thread pool
+        try:
+            weekday_totals, from_cache = await run_in_thread(get_weekday_counts, "../" + input_file_path)
+        except DateParseError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Error parsing dates: {str(e)}"
+            }
+
+        # Count occurrences of specified weekday
+        all_weekday_counts = dict(zip(calendar.day_name, weekday_totals))
+        weekday_counts = all_weekday_counts.get(weekday_to_count.capitalize(), 0)
         
         # Create result string
         result = f"{weekday_counts}\n"
@@ -57,7 +50,9 @@ async def run_count_days(input_file_path, weekday_to_count, output_file_path = N
         return {
             "status": "success",
             "message": f"Successfully counted {weekday_to_count}s and wrote result to {output_file_path}",
-            "count": weekday_counts
+            "count": weekday_counts,
+            "weekday_counts": all_weekday_counts,
+            "cached": from_cache
         }
 
     except Exception as e:
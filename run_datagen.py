@@ -1,18 +1,19 @@
-import subprocess
 import os
 
+from task_runner import run_subprocess
+
 
 DATA_DIR = '/data'
 
 async def install_uv():
     try:
         # Check if uv is installed
-        subprocess.run(['uv', '--version'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        await run_subprocess('uv', '--version')
         print("uv is already installed")
     except FileNotFoundError:
         print("Installing uv...")
         # Install uv using curl command
-        os.system('curl -LsSf https://astral.sh/uv/install.sh | sh')
+        await run_subprocess('curl -LsSf https://astral.sh/uv/install.sh | sh', shell=True)
 
 async def run_datagen(command_to_run=None, file_url=None, argument_to_pass=None, is_url_remote=None, is_remote_safe=None):
     # Install uv
@@ -20,8 +21,10 @@ async def run_datagen(command_to_run=None, file_url=None, argument_to_pass=None,
 
     # Ensure uv installation completed successfully
     try:
-        subprocess.run(['uv', '--version'], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    except subprocess.CalledProcessError:
+        returncode, _, _ = await run_subprocess('uv', '--version')
+    except FileNotFoundError:
+        returncode = 1
+    if returncode != 0:
         return {
             "status": "error",
             "message": "Failed to install uv"
@@ -37,8 +40,8 @@ async def run_datagen(command_to_run=None, file_url=None, argument_to_pass=None,
     try:
         os.makedirs(DATA_DIR, exist_ok=True)
         # Download the script
-        result = subprocess.run(['curl', '-o', f"{DATA_DIR}/datagen.py", file_url], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if result.returncode == 0:
+        returncode, _, _ = await run_subprocess('curl', '-o', f"{DATA_DIR}/datagen.py", file_url)
+        if returncode == 0:
             print(f"Successfully downloaded script from {file_url}")
         else:
             return {
@@ -47,18 +50,18 @@ async def run_datagen(command_to_run=None, file_url=None, argument_to_pass=None,
             }
         
         # Run the script with argument
-        process = subprocess.run(['uv', 'run', f"{DATA_DIR}/datagen.py", argument_to_pass], capture_output=True, text=True)
-        if process.returncode == 0:
+        returncode, stdout, stderr = await run_subprocess('uv', 'run', f"{DATA_DIR}/datagen.py", argument_to_pass)
+        if returncode == 0:
             print(f"Successfully ran datagen.py with argument: {argument_to_pass}")
             return {
                 "status": "success",
                 "message": f"Successfully ran datagen.py with argument: {argument_to_pass}",
-                "output": process.stdout
+                "output": stdout
             }
         else:
             return {
                 "status": "error",
-                "message": f"Failed to run datagen.py: {process.stderr}"
+                "message": f"Failed to run datagen.py: {stderr}"
             }
     except Exception as e:
         return {
@@ -67,4 +70,5 @@ async def run_datagen(command_to_run=None, file_url=None, argument_to_pass=None,
         }
     finally:
         # Clean up downloaded script
-        os.remove(f"{DATA_DIR}/datagen.py")
\ No newline at end of file
+        if os.path.exists(f"{DATA_DIR}/datagen.py"):
+            os.remove(f"{DATA_DIR}/datagen.py")
\ No newline at end of file
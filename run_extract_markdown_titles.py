@@ -4,6 +4,54 @@ import json
 from typing import Dict, Any
 import re
 
+from file_readers import read_files
+from json_backend import dump_json
+
+
+MANIFEST_NAME = ".markdown_titles.json"
+
+H1_PATTERN = re.compile(r'#\s+(.+)$')
+HEADING_PATTERN = re.compile(r'#{1,6}\s+(.+)$')
+
+
+def _extract_title(file_path: str) -> str:
+    # Stream line by line and stop at the first level 1 heading
+    fallback = None
+    with open(file_path, 'r') as f:
+        for line in f:
+            line = line.rstrip("\n")
+            title_match = H1_PATTERN.match(line)
+            if title_match:
+                return title_match.group(1).strip()
+
+            # Remember the first heading of any level in case there is no H1
+            if fallback is None:
+                heading_match = HEADING_PATTERN.match(line)
+                if heading_match:
+                    fallback = heading_match.group(1).strip()
+
+    # Use filename as title if no heading found
+    if fallback is not None:
+        return fallback
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def _load_manifest(manifest_path: str) -> Dict[str, Any]:
+    try:
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_manifest(manifest_path: str, manifest: Dict[str, Any]) -> None:
+    try:
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+    except OSError as e:
+        print(f"Could not write markdown manifest {manifest_path}: {e}")
+
+
 async def run_extract_markdown_titles(
     input_directory: str,
     output_file_path: str,
@@ -36,49 +84,56 @@ async def run_extract_markdown_titles(
                 "message": f"No markdown files found matching pattern: {file_pattern}"
             }
 
-        # Dictionary to store file paths and their titles
-        markdown_index = {}
+        # Stat every file and only re-read the ones that are new or changed
+        manifest_path = os.path.join(full_input_path, MANIFEST_NAME)
+        manifest = _load_manifest(manifest_path)
+        stats = await read_files(os.stat, md_files)
 
-        # Process each markdown file
-        for file_path in md_files:
-            try:
-                with open(file_path, 'r') as f:
-                    content = f.read()
-                    
-                    # Extract first level 1 heading (# Title)
-                    title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-                    
-                    # If no level 1 heading, try to get first heading of any level
-                    if not title_match:
-                        title_match = re.search(r'^#{1,6}\s+(.+)$', content, re.MULTILINE)
-
-                    # Use filename as title if no heading found
-                    if title_match:
-                        title = title_match.group(1).strip()
-                    else:
-                        title = os.path.splitext(os.path.basename(file_path))[0]
-
-                    # Store just the file name
-                    rel_path = os.path.basename(file_path)
-                    markdown_index[rel_path] = title
-
-            except Exception as e:
+        updated_manifest = {}
+        changed_files = []
+        for file_path, stat in zip(md_files, stats):
+            if isinstance(stat, Exception):
                 return {
                     "status": "error",
-                    "message": f"Error processing file {file_path}: {str(e)}"
+                    "message": f"Error processing file {file_path}: {str(stat)}"
                 }
+            key = os.path.relpath(file_path, full_input_path)
+            entry = manifest.get(key)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                updated_manifest[key] = entry
+            else:
+                updated_manifest[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+                changed_files.append(file_path)
+
+        # Read the changed files concurrently on the shared file reader pool
+        titles = await read_files(_extract_title, changed_files)
+        for file_path, title in zip(changed_files, titles):
+            if isinstance(title, Exception):
+                return {
+                    "status": "error",
+                    "message": f"Error processing file {file_path}: {str(title)}"
+                }
+            updated_manifest[os.path.relpath(file_path, full_input_path)]["title"] = title
+
+        _save_manifest(manifest_path, updated_manifest)
+
+        # Dictionary to store file paths and their titles, keyed by file name
+        markdown_index = {}
+        for file_path in md_files:
+            rel_path = os.path.basename(file_path)
+            markdown_index[rel_path] = updated_manifest[os.path.relpath(file_path, full_input_path)]["title"]
 
         # Write index to output file
         full_output_path = os.path.join("..", output_file_path)
         os.makedirs(os.path.dirname(full_output_path), exist_ok=True)
-        
-        with open(full_output_path, 'w') as f:
-            json.dump(markdown_index, f, indent=2)
+
+        dump_json(markdown_index, full_output_path)
 
         return {
             "status": "success",
             "message": f"Successfully created index with {len(markdown_index)} entries in {output_file_path}",
-            "files_processed": len(markdown_index)
+            "files_processed": len(markdown_index),
+            "files_read": len(changed_files)
         }
 
     except Exception as e:
@@ -1,6 +1,50 @@
+import asyncio
 import os
-import httpx
 from pathlib import Path
+from http_client import get_http_client
+from email_batching import (
+    EMAIL_CHUNK_CHARS,
+    EMAIL_LLM_CONCURRENCY,
+    chunk_messages,
+    is_sender_instruction,
+    local_sender,
+    split_messages,
+)
+
+
+async def _call_llm(headers, process_instruction, email_text, num_messages=1):
+    """Run the instruction over one chunk of email text and return the non-empty result."""
+    prompt = f"Given the following text, {process_instruction}:\n\n{email_text}"
+    if num_messages > 1:
+        prompt = (
+            f"Given the following {num_messages} emails, {process_instruction}. "
+            f"Answer with one result per line and nothing else:\n\n{email_text}"
+        )
+    payload = {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": "You are a helpful assistant that processes email text."},
+            {"role": "user", "content": prompt}
+        ]
+    }
+
+    # Call the API using the shared pooled client
+    client = get_http_client()
+    response = await client.post(
+        "https://aiproxy.sanand.workers.dev/openai/v1/chat/completions",
+        headers=headers,
+        json=payload
+    )
+    response.raise_for_status()
+    data = response.json()
+
+    # Extract the processed result
+    response_message = data["choices"][0]["message"]
+    result = response_message.get("content", "").strip()
+    if not result:
+        raise ValueError("No content returned in API call.")
+    return result
+
 
 async def run_extract_on_email(input_file_path="/data/email.txt", 
                         output_file_path="/data/email-sender.txt",
@@ -14,41 +58,65 @@ async def run_extract_on_email(input_file_path="/data/email.txt",
         with open(input_file_path, 'r', encoding='utf-8') as file:
             email_text = file.read()
 
-        # Retrieve API token
-        proxy_token = os.getenv('AIPROXY_TOKEN')
-        if not proxy_token:
-            raise ValueError("AIPROXY_TOKEN not found in environment variables")
+        messages = split_messages(email_text)
 
-        headers = {
-            "Authorization": f"Bearer {proxy_token}",
-            "Content-Type": "application/json"
-        }
+        # Sender addresses come straight from well-formed From: headers;
+        # only messages whose header does not parse need the LLM
+        sender_only = is_sender_instruction(process_instruction)
+        results = [None] * len(messages)
+        if sender_only:
+            results = [local_sender(message) for message in messages]
+        pending = [index for index, result in enumerate(results) if result is None]
 
-        # Create prompt for GPT similar to main.py
-        prompt = f"Given the following text, {process_instruction}:\n\n{email_text}"
-        payload = {
-            "model": "gpt-4o-mini",
-            "messages": [
-                {"role": "system", "content": "You are a helpful assistant that processes email text."},
-                {"role": "user", "content": prompt}
-            ]
-        }
+        llm_calls = 0
+        if pending:
+            # Retrieve API token
+            proxy_token = os.getenv('AIPROXY_TOKEN')
+            if not proxy_token:
+                raise ValueError("AIPROXY_TOKEN not found in environment variables")
 
-        # Call the API using async httpx
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://aiproxy.sanand.workers.dev/openai/v1/chat/completions",
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-            data = response.json()
-
-        # Extract the processed result
-        response_message = data["choices"][0]["message"]
-        result = response_message.get("content", "").strip()
-        if not result:
-            raise ValueError("No content returned in API call.")
+            headers = {
+                "Authorization": f"Bearer {proxy_token}",
+                "Content-Type": "application/json"
+            }
+
+            if len(pending) == len(messages) and len(email_text) <= EMAIL_CHUNK_CHARS:
+                # Small input: a single prompt over the text as given
+                chunks = [[email_text]]
+            else:
+                chunks = chunk_messages([messages[index] for index in pending])
+
+            semaphore = asyncio.Semaphore(max(1, EMAIL_LLM_CONCURRENCY))
+
+            async def process_chunk(chunk):
+                async with semaphore:
+                    return await _call_llm(headers, process_instruction, "\n\n".join(chunk), len(chunk))
+
+            # Chunks run concurrently; gather keeps their order for the merge
+            chunk_results = await asyncio.gather(*(process_chunk(chunk) for chunk in chunks))
+            llm_calls = len(chunks)
+
+            iter_pending = iter(pending)
+            for chunk, chunk_result in zip(chunks, chunk_results):
+                # Attach each chunk's output to its first pending message slot
+                results[next(iter_pending)] = chunk_result
+                for _ in chunk[1:]:
+                    next(iter_pending, None)
+
+        if sender_only:
+            # Merge in mailbox order, listing each sender once
+            merged = []
+            seen = set()
+            for result in results:
+                for line in (result or "").splitlines():
+                    line = line.strip()
+                    if line and line not in seen:
+                        seen.add(line)
+                        merged.append(line)
+            result = "\n".join(merged)
+        else:
+            # Any other instruction's output is written as the LLM gave it
+            result = "\n".join(result for result in results if result is not None)
 
         # Create output directory if it doesn't exist
         output_dir = os.path.dirname(output_file_path)
@@ -61,11 +129,13 @@ async def run_extract_on_email(input_file_path="/data/email.txt",
 
         return {
             "status": "success",
-            "message": f"Results written to {output_file_path}"
+            "message": f"Results written to {output_file_path}",
+            "messages": len(messages),
+            "llm_calls": llm_calls
         }
 
     except Exception as e:
         return {
             "status": "error",
             "message": str(e)
-        }
\ No newline at end of file
+        }
@@ -1,5 +1,7 @@
-import subprocess
 import os
+import shlex
+
+from task_runner import run_subprocess
 
 async def run_prettier_format(file_path, command_to_run, is_prettier, prettier_version):
     """
@@ -21,18 +23,24 @@ async def run_prettier_format(file_path, command_to_run, is_prettier, prettier_v
                     "status": "error",
                     "message": f"File not found at path: {file_path}"
                 }
-            full_command = f"npx {command_to_run} --write {file_path}"
-            result = subprocess.run(full_command, shell=True, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            full_command = ["npx", *shlex.split(command_to_run), "--write", file_path]
+            returncode, stdout, stderr = await run_subprocess(*full_command)
+            if returncode != 0:
+                return {
+                    "status": "error",
+                    "message": f"Error formatting file {file_path} using prettier@{prettier_version}.",
+                    "output": stderr
+                }
             return {
                 "status": "success",
                 "message": f"File {file_path} formatted successfully using prettier@{prettier_version}.",
-                "output": result.stdout.decode()
+                "output": stdout
             }
-        except subprocess.CalledProcessError as e:
+        except FileNotFoundError as e:
             return {
                 "status": "error",
                 "message": f"Error formatting file {file_path} using prettier@{prettier_version}.",
-                "output": e.stderr.decode()
+                "output": str(e)
             }
     else:
         return {
@@ -2,7 +2,42 @@ import json
 import os
 from typing import List, Dict, Any
 
-async def run_sort_array_of_contacts(input_file_path: str, output_file_path: str, sort_attributes: List[str]) -> Dict[str, Any]:
+from contact_sorting import contact_sort_key, sort_contacts
+from external_sort import external_sort, CONTACT_SORT_MEMORY_BUDGET_MB, OBJECT_OVERHEAD_FACTOR
+from json_backend import load_json, dump_json
+from json_stream import iter_json_array, write_json_array
+from task_runner import run_in_thread
+
+
+def _sort_contacts_external(
+    input_path: str,
+    output_path: str,
+    sort_attributes: List[str],
+    memory_budget_mb: float
+) -> int:
+    # Write next to the output and rename, so sorting a file in place is safe
+    tmp_path = f"{output_path}.tmp"
+    try:
+        with open(input_path, 'r') as infile, open(tmp_path, 'w') as outfile:
+            sorted_contacts = external_sort(
+                iter_json_array(infile),
+                key=contact_sort_key(sort_attributes),
+                memory_budget_mb=memory_budget_mb
+            )
+            count = write_json_array(outfile, sorted_contacts, indent=2)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
+
+
+async def run_sort_array_of_contacts(
+    input_file_path: str,
+    output_file_path: str,
+    sort_attributes: List[str],
+    memory_budget_mb: float = CONTACT_SORT_MEMORY_BUDGET_MB
+) -> Dict[str, Any]:
     """
     Sort an array of contacts based on specified attributes.
 
@@ -10,6 +45,7 @@ async def run_sort_array_of_contacts(input_file_path: str, output_file_path: str
         input_file_path (str): Path to the input JSON file containing contacts
         output_file_path (str): Path where the sorted contacts should be written
         sort_attributes (List[str]): List of attributes to sort by in order of priority
+        memory_budget_mb (float): Files larger than this in memory are sorted externally
 
     Returns:
         Dict[str, Any]: Response dictionary containing status and message
@@ -22,9 +58,38 @@ async def run_sort_array_of_contacts(input_file_path: str, output_file_path: str
                 "message": f"Input file not found at: {input_file_path}"
             }
 
+        # Large files are streamed through an external merge sort instead of loaded
+        if os.path.getsize("../" + input_file_path) * OBJECT_OVERHEAD_FACTOR > memory_budget_mb * 1024 * 1024:
+            try:
+                # Sorting and file I/O are blocking, so they run on the task thread pool
+                count = await run_in_thread(
+                    _sort_contacts_external,
+                    "../" + input_file_path,
+                    "../" + output_file_path,
+                    sort_attributes,
+                    memory_budget_mb
+                )
+            except json.JSONDecodeError:
+                raise
+            except ValueError as e:
+                # Raised by the streaming reader when the input is not an array
+                return {
+                    "status": "error",
+                    "message": str(e)
+                }
+            except Exception as e:
+                return {
+                    "status": "error",
+                    "message": f"Error sorting contacts: {str(e)}"
+                }
+            return {
+                "status": "success",
+                "message": f"Successfully sorted contacts and wrote result to {output_file_path}",
+                "count": count
+            }
+
         # Read the JSON file
-        with open("../" + input_file_path, 'r') as file:
-            contacts = json.load(file)
+        contacts = await run_in_thread(load_json, "../" + input_file_path)
 
         # Validate input is a list
         if not isinstance(contacts, list):
@@ -33,12 +98,9 @@ async def run_sort_array_of_contacts(input_file_path: str, output_file_path: str
                 "message": "Input file must contain an array of contacts"
             }
 
-        # Sort contacts based on multiple attributes
+        # Sort contacts based on multiple attributes, column by column when possible
         try:
-            sorted_contacts = sorted(
-                contacts,
-                key=lambda x: [str(x.get(attr, "")).lower() for attr in sort_attributes]
-            )
+            sorted_contacts = await run_in_thread(sort_contacts, contacts, sort_attributes)
         except Exception as e:
             return {
                 "status": "error",
@@ -46,8 +108,7 @@ async def run_sort_array_of_contacts(input_file_path: str, output_file_path: str
             }
 
         # Write sorted contacts to output file
-        with open("../" + output_file_path, 'w') as f:
-            json.dump(sorted_contacts, f, indent=2)
+        await run_in_thread(dump_json, sorted_contacts, "../" + output_file_path)
 
         return {
             "status": "success",
@@ -1,15 +1,17 @@
 import os
-import glob
+import fnmatch
+import heapq
 from typing import Dict, Any
-from datetime import datetime
-import re
+
+from file_readers import head_lines, tail_lines, read_files
 
 async def run_write_most_recent_logs(
     input_directory: str,
     file_pattern: str,
     output_file_path: str,
     num_files: int,
-    lines_per_file: int
+    lines_per_file: int,
+    read_from_end: bool = False
 ) -> Dict[str, Any]:
     """
     Write most recent log entries from multiple files to a single output file.
@@ -20,6 +22,7 @@ async def run_write_most_recent_logs(
         output_file_path (str): Path where the combined log entries should be written
         num_files (int): Number of most recent log files to process
         lines_per_file (int): Number of lines to extract from each file
+        read_from_end (bool): Take the last lines of each file instead of the first
 
     Returns:
         Dict[str, Any]: Response dictionary containing status and message
@@ -39,36 +42,43 @@ async def run_write_most_recent_logs(
                 "message": f"Input directory not found: {input_directory}"
             }
 
-        # Get list of log files matching pattern
-        search_pattern = os.path.join(full_input_path, file_pattern)
-        log_files = glob.glob(search_pattern)
+        # Walk the directory once with scandir, reusing each entry's cached stat
+        include_hidden = file_pattern.startswith(".")
+        candidates = []
+        with os.scandir(full_input_path) as entries:
+            for entry in entries:
+                if not fnmatch.fnmatch(entry.name, file_pattern):
+                    continue
+                if entry.name.startswith(".") and not include_hidden:
+                    continue
+                if entry.is_file():
+                    candidates.append((entry.stat().st_mtime, entry.path))
 
-        if not log_files:
+        if not candidates:
             return {
                 "status": "error",
                 "message": f"No log files found matching pattern: {file_pattern}"
             }
 
-        # Sort files by modification time, newest first
-        log_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
+        # Select only the N newest files instead of sorting the whole directory
+        selected_files = [
+            path for _, path in heapq.nlargest(num_files, candidates, key=lambda c: c[0])
+        ]
 
-        # Take only the specified number of most recent files
-        selected_files = log_files[:num_files]
+        # Read the selected files concurrently, keeping newest-first order
+        read_lines = tail_lines if read_from_end else head_lines
+        file_lines = await read_files(read_lines, selected_files, lines_per_file)
 
-        # Process each file and collect recent lines
         combined_logs = []
-        for file_path in selected_files:
-            try:
-                with open(file_path, 'r') as f:
-                    # Read all lines and take the last 'first_line_per_file' lines
-                    lines = f.readlines()
-                    recent_lines = lines[:1]
-                    combined_logs.extend(recent_lines)
-            except Exception as e:
+        for file_path, lines in zip(selected_files, file_lines):
+            if isinstance(lines, Exception):
                 return {
                     "status": "error",
-                    "message": f"Error reading file {file_path}: {str(e)}"
+                    "message": f"Error reading file {file_path}: {str(lines)}"
                 }
+            for line in lines:
+                # Keep lines from different files from running together
+                combined_logs.append(line if line.endswith("\n") else line + "\n")
 
         # Write combined logs to output file
         full_output_path = os.path.join("..", output_file_path)
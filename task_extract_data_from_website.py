@@ -1,20 +1,25 @@
 import httpx
-from bs4 import BeautifulSoup
-import json
-import csv
 import os
-from urllib.parse import urljoin
 import logging
 from typing import List, Dict, Union
 
-def task_extract_data_from_website(
+from http_cache import http_cache
+from http_client import get_http_client
+from task_runner import run_in_thread
+from web_crawler import crawl
+from html_extractors import make_extractor, HTML_PARSER_BACKEND
+from output_sinks import open_sink, JSON_LINES_FORMATS
+
+
+async def task_extract_data_from_website(
     website_url: str,
     css_selectors: List[str],
     output_file_path: str,
     data_format: str = "json",
     max_depth: int = 1,
     request_headers: Dict = None,
-    timeout: int = 30
+    timeout: int = 30,
+    parser_backend: str = HTML_PARSER_BACKEND
 ) -> Dict[str, Union[str, int]]:
     """
     Extract data from a website using provided CSS selectors and save to specified format
@@ -23,10 +28,11 @@ def task_extract_data_from_website(
         website_url (str): URL of the website to scrape
         css_selectors (list): List of CSS selectors to target elements
         output_file_path (str): Path where scraped data will be saved
-        data_format (str): Format to save data (json or csv)
+        data_format (str): Format to save data (json, jsonl or csv)
         max_depth (int): Maximum depth of pages to crawl
         request_headers (dict): Custom headers for the HTTP request
         timeout (int): Request timeout in seconds
+        parser_backend (str): HTML parser to use: bs4 (default), lxml or selectolax
     
     Returns:
         dict: Status of the operation including number of elements found
@@ -43,49 +49,39 @@ def task_extract_data_from_website(
     try:
         # Create output directory if it doesn't exist
         os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
-        
-        scraped_data = []
-        visited_urls = set()
 
-        # Using httpx client with context manager
-        with httpx.Client(headers=request_headers, timeout=timeout) as client:
-            def scrape_page(url: str, depth: int):
-                if depth > max_depth or url in visited_urls:
-                    return
-                
-                visited_urls.add(url)
-                logger.info(f"Scraping URL: {url}")
-                
-                response = client.get(url)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                page_data = {}
-                
-                for selector in css_selectors:
-                    elements = soup.select(selector)
-                    page_data[selector] = [elem.text.strip() for elem in elements]
-                
-                scraped_data.append(page_data)
+        # Using the shared pooled httpx client
+        client = get_http_client()
 
-            # Start scraping from the initial URL
-            scrape_page(website_url, 1)
+        # Selectors are compiled once for the whole crawl
+        extract_page = make_extractor(css_selectors, parser_backend)
+
+        async def fetch(url: str) -> httpx.Response:
+            logger.info(f"Scraping URL: {url}")
+            response = await http_cache.arequest(client, "GET", url, headers=request_headers, timeout=timeout)
+            response.raise_for_status()
+            return response
+
+        async def process_page(url: str, response: httpx.Response):
+            # HTML parsing is CPU bound, so keep it off the event loop
+            return await run_in_thread(extract_page, response.text, url)
+
+        # Results are written as each page finishes instead of kept in memory
+        output_format = data_format.lower()
+        if output_format not in ("json", "csv", *JSON_LINES_FORMATS):
+            output_format = "csv"
+        with open_sink(output_file_path, output_format, columns=["url", *css_selectors]) as sink:
+
+            def on_result(url: str, depth: int, page_data: Dict):
+                sink.write(page_data)
+
+            stats = await crawl(website_url, max_depth or 1, fetch, process_page, on_result)
+            pages_written = sink.count
 
-        # Save the scraped data
-        if data_format.lower() == 'json':
-            with open(output_file_path, 'w', encoding='utf-8') as f:
-                json.dump(scraped_data, f, indent=2)
-        else:  # csv format
-            with open(output_file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                # Write headers
-                writer.writerow(css_selectors)
-                # Write data
-                writer.writerows(scraped_data)
-        
         return {
             'status': 'success',
-            'elements_found': len(scraped_data),
+            'elements_found': pages_written,
+            'pages_failed': stats['errors'],
             'output_file': output_file_path
         }
         
@@ -2,8 +2,80 @@ import httpx
 import json
 import os
 
+from api_pagination import iter_pages, write_pages, request_with_retries
+from http_cache import http_cache
+from http_client import get_sync_http_client
+from json_backend import loads_json, dump_json
+from json_stream import iter_json_array, write_json_array
+
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+
+def _pretty_print_json_file(source_path, output_path):
+    """Validate and re-indent a downloaded JSON file, streaming top-level arrays."""
+    with open(source_path, 'r', encoding='utf-8') as f:
+        first_char = f.read(1)
+        while first_char and first_char.isspace():
+            first_char = f.read(1)
+    # Write next to the output and rename, so invalid JSON never leaves a truncated file
+    tmp_path = f"{output_path}.tmp"
+    try:
+        if first_char == "[":
+            with open(source_path, 'r', encoding='utf-8') as infile, \
+                    open(tmp_path, 'w', encoding='utf-8') as outfile:
+                count = write_json_array(outfile, iter_json_array(infile), indent=2)
+        else:
+            # Only arrays can be re-indented element by element; other documents are loaded
+            with open(source_path, 'rb') as f:
+                data = loads_json(f.read())
+            dump_json(data, tmp_path)
+            count = 1
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
+
+
+def _stream_response_to_file(client, http_method, api_url, request_headers,
+                             request_params, output_file_path, pretty_print_json):
+    """Write the response body to disk chunk by chunk and return a summary."""
+    tmp_path = f"{output_file_path}.part"
+    bytes_written = 0
+    try:
+        with client.stream(
+            method=http_method,
+            url=api_url,
+            headers=request_headers,
+            params=request_params
+        ) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "")
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    bytes_written += len(chunk)
+
+        if pretty_print_json:
+            _pretty_print_json_file(tmp_path, output_file_path)
+        else:
+            os.replace(tmp_path, output_file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return {
+        "status": "success",
+        "output_file": output_file_path,
+        "bytes_downloaded": bytes_written,
+        "content_type": content_type
+    }
+
+
 def task_fetch_data_from_api(api_url, http_method='GET', output_file_path=None, 
-                            request_headers=None, request_params=None):
+                            request_headers=None, request_params=None,
+                            stream_to_file=False, pretty_print_json=False,
+                            pagination=None, output_format='json'):
     """
     Fetches data from an API and saves it to a file.
     
@@ -13,29 +85,61 @@ def task_fetch_data_from_api(api_url, http_method='GET', output_file_path=None,
         output_file_path (str): Path where the API response should be saved
         request_headers (dict): Headers to include in the API request
         request_params (dict): Query parameters for the API request
+        stream_to_file (bool): Write the body to output_file_path as it arrives
+            instead of buffering and parsing it
+        pretty_print_json (bool): When streaming, validate the JSON and re-indent it
+        pagination (dict): Paging scheme, e.g. {"type": "page", "page_size": 100};
+            see api_pagination.iter_pages for the supported keys
+        output_format (str): 'json' for one merged array or 'jsonl' for JSON Lines
+            when paginating
     
     Returns:
-        dict: API response data
+        dict: API response data, or a summary when streaming or paginating
     """
     try:
         # Set default values if None
         request_headers = request_headers or {}
         request_params = request_params or {}
         
-        # Make the API request using a client context manager
-        with httpx.Client() as client:
-            response = client.request(
-                method=http_method,
-                url=api_url,
-                headers=request_headers,
-                params=request_params
+        # Make the API request using the shared pooled client
+        client = get_sync_http_client()
+
+        # Streaming keeps memory flat regardless of the payload size
+        if stream_to_file and output_file_path:
+            os.makedirs(os.path.dirname(output_file_path) or ".", exist_ok=True)
+            return _stream_response_to_file(
+                client, http_method, api_url, request_headers,
+                request_params, output_file_path, pretty_print_json
             )
-            
-            # Raise an exception for bad status codes
-            response.raise_for_status()
-            
-            # Parse the response
-            data = response.json()
+
+        # Paged results are fetched concurrently and written out page by page
+        if pagination:
+            pages = iter_pages(
+                client, http_method, api_url, request_headers, request_params, pagination
+            )
+            if not output_file_path:
+                return [item for items in pages for item in items]
+            os.makedirs(os.path.dirname(output_file_path) or ".", exist_ok=True)
+            counts = write_pages(pages, output_file_path, output_format)
+            return {
+                "status": "success",
+                "output_file": output_file_path,
+                **counts
+            }
+
+        # Served from the HTTP cache when fresh; otherwise retries transient
+        # failures and raises for bad status codes
+        response = http_cache.request(
+            client,
+            http_method,
+            api_url,
+            send=lambda *args, **kwargs: request_with_retries(client, *args, **kwargs),
+            headers=request_headers,
+            params=request_params
+        )
+
+        # Parse the response
+        data = loads_json(response.content)
         
         # Save to file if output path is provided
         if output_file_path:
@@ -43,8 +147,7 @@ def task_fetch_data_from_api(api_url, http_method='GET', output_file_path=None,
             os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
             
             # Write the data to file
-            with open(output_file_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            dump_json(data, output_file_path)
         
         return data
         
@@ -0,0 +1,301 @@
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Rule matches below this confidence fall back to the LLM in `parse_task`
+ROUTER_MIN_CONFIDENCE = float(os.getenv("ROUTER_MIN_CONFIDENCE", "0.9"))
+
+APPROVED_DATAGEN_URL = "https://raw.githubusercontent.com/sanand0/tools-in-data-science-public/tds-2025-01/project-1/datagen.py"
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+DATA_PATH_RE = re.compile(r"/data(?:/[\w\-.]+)*/?")
+URL_RE = re.compile(r"https?://[^\s,;)]+")
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+router_stats = {"hits": 0, "fallbacks": 0}
+
+
+def _clean(token: str) -> str:
+    # Sentence punctuation is never part of a path or URL in these tasks
+    return token.rstrip(".,;:")
+
+
+def _data_paths(task: str) -> List[Tuple[int, str]]:
+    return [(m.start(), _clean(m.group(0))) for m in DATA_PATH_RE.finditer(task)]
+
+
+def _path_after(task: str, words: str) -> Optional[str]:
+    """Return the first /data path directly following one of `words`."""
+    match = re.search(rf"\b(?:{words})\s+(?:the\s+)?(?:file\s+)?(/data(?:/[\w\-.]+)*/?)", task, re.IGNORECASE)
+    return _clean(match.group(1)) if match else None
+
+
+def _input_output_paths(task: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Split the /data paths of a task into (input, output).
+
+    The output is the path after "to"/"into"/"at"; the input is the first
+    other path in the task.
+    """
+    output_path = _path_after(task, "to|into|at|in file")
+    input_path = None
+    for _, path in _data_paths(task):
+        if path != output_path:
+            input_path = path
+            break
+    return input_path, output_path
+
+
+def _route_datagen(task: str) -> Optional[Dict[str, Any]]:
+    if not re.search(r"\buv\b", task) or "datagen" not in task.lower():
+        return None
+    url = next((_clean(u) for u in URL_RE.findall(task)), None)
+    email = next((e for e in EMAIL_RE.findall(task) if not url or e not in url), None)
+    # Anything but the approved script needs the LLM's judgement
+    if url != APPROVED_DATAGEN_URL or not email:
+        return None
+    return {
+        "command_to_run": "uv run",
+        "file_url": url,
+        "argument_to_pass": email,
+        "is_url_remote": "true",
+        "is_remote_safe": "true"
+    }
+
+
+def _route_prettier(task: str) -> Optional[Dict[str, Any]]:
+    match = re.search(r"\b(prettier)(?:@([\w.\-]+))?", task, re.IGNORECASE)
+    paths = _data_paths(task)
+    if not match or not re.search(r"\bformat", task, re.IGNORECASE) or len(paths) != 1:
+        return None
+    version = _clean(match.group(2) or "")
+    return {
+        "file_path": paths[0][1],
+        "command_to_run": f"prettier@{version}" if version else "prettier",
+        "is_prettier": "true",
+        "prettier_version": version or "latest"
+    }
+
+
+def _route_count_days(task: str) -> Optional[Dict[str, Any]]:
+    if not re.search(r"\b(count|how many|number of)\b", task, re.IGNORECASE):
+        return None
+    weekdays = {w for w in WEEKDAYS if re.search(rf"\b{w}s?\b", task, re.IGNORECASE)}
+    input_path, output_path = _input_output_paths(task)
+    if len(weekdays) != 1 or not input_path or not output_path:
+        return None
+    return {
+        "input_file_path": input_path,
+        "weekday_to_count": weekdays.pop().capitalize(),
+        "output_file_path": output_path
+    }
+
+
+def _route_sort_contacts(task: str) -> Optional[Dict[str, Any]]:
+    if not re.search(r"\bsort", task, re.IGNORECASE) or "contact" not in task.lower():
+        return None
+    match = re.search(r"\bby\s+(.+?)(?:,?\s+(?:and\s+)?(?:write|save|store)\b|$)", task, re.IGNORECASE)
+    input_path, output_path = _input_output_paths(task)
+    if not match or not input_path or not output_path:
+        return None
+    attributes = [a for a in re.split(r"\s*(?:,|\bthen\b|\band\b)\s*", match.group(1)) if a]
+    if not attributes or not all(re.fullmatch(r"\w+", a) for a in attributes):
+        return None
+    # Sort direction can't be expressed in the plan, so it must not pass as a field name
+    if any(a.lower() in ("asc", "ascending", "desc", "descending", "reverse", "reversed") for a in attributes):
+        return None
+    return {
+        "input_file_path": input_path,
+        "output_file_path": output_path,
+        "sort_attributes": attributes
+    }
+
+
+def _route_recent_logs(task: str) -> Optional[Dict[str, Any]]:
+    count = re.search(r"\b(\d+)\s+most\s+recent\b", task, re.IGNORECASE)
+    extension = re.search(r"(\.\w+)\s+files?\b", task, re.IGNORECASE)
+    if not count or not extension:
+        return None
+    lines = re.search(r"\bfirst\s+(\d+\s+)?lines?\b", task, re.IGNORECASE)
+    input_path, output_path = _input_output_paths(task)
+    if not lines or not input_path or not output_path:
+        return None
+    return {
+        "input_directory": input_path if input_path.endswith("/") else f"{input_path}/",
+        "file_pattern": f"*{extension.group(1)}",
+        "output_file_path": output_path,
+        "num_files": int(count.group(1)),
+        "lines_per_file": int(lines.group(1) or 1)
+    }
+
+
+def _route_markdown_titles(task: str) -> Optional[Dict[str, Any]]:
+    if not re.search(r"\bmarkdown\b|\.md\b", task, re.IGNORECASE):
+        return None
+    if not re.search(r"\b(H1|heading|title)", task, re.IGNORECASE):
+        return None
+    input_path, output_path = _input_output_paths(task)
+    if not input_path or not output_path:
+        return None
+    return {
+        "input_directory": input_path if input_path.endswith("/") else f"{input_path}/",
+        "output_file_path": output_path,
+        "file_pattern": "*.md",
+        "tag_pattern": "#"
+    }
+
+
+def _route_email(task: str) -> Optional[Dict[str, Any]]:
+    match = re.search(r"\bextract\s+(?:the\s+)?(sender\S*\s+email(?:\s+address)?)", task, re.IGNORECASE)
+    input_path, output_path = _input_output_paths(task)
+    if not match or not input_path or not output_path:
+        return None
+    return {
+        "input_file_path": input_path,
+        "output_file_path": output_path,
+        "process_instruction": f"extract the {match.group(1)}"
+    }
+
+
+def _route_card_number(task: str) -> Optional[Dict[str, Any]]:
+    if not re.search(r"\bcard number\b", task, re.IGNORECASE):
+        return None
+    image = re.search(r"/data(?:/[\w\-.]+)*\.(?:png|jpe?g|webp)\b", task, re.IGNORECASE)
+    _, output_path = _input_output_paths(task)
+    if not image or not output_path:
+        return None
+    instruction = "extract card number"
+    if re.search(r"without spaces", task, re.IGNORECASE):
+        instruction += " without spaces"
+    return {
+        "input_image_path": image.group(0),
+        "output_file_path": output_path,
+        "process_instruction": instruction
+    }
+
+
+def _route_fetch_api(task: str) -> Optional[Dict[str, Any]]:
+    if not re.search(r"\b(fetch|download|get)\b.*\bAPI\b", task, re.IGNORECASE):
+        return None
+    urls = [_clean(u) for u in URL_RE.findall(task)]
+    _, output_path = _input_output_paths(task)
+    if len(urls) != 1 or not output_path:
+        return None
+    return {
+        "api_url": urls[0],
+        "http_method": "GET",
+        "output_file_path": output_path,
+        "request_headers": {},
+        "request_params": {}
+    }
+
+
+# One grammar per `custom_function` entry. Website scraping needs CSS selectors
+# that can't be read off the task reliably, so it always goes to the LLM.
+TASK_RULES: Dict[str, Callable[[str], Optional[Dict[str, Any]]]] = {
+    "run_datagen": _route_datagen,
+    "run_prettier_format": _route_prettier,
+    "run_count_days": _route_count_days,
+    "run_sort_array_of_contacts": _route_sort_contacts,
+    "run_write_most_recent_logs": _route_recent_logs,
+    "run_extract_markdown_titles": _route_markdown_titles,
+    "run_extract_on_email": _route_email,
+    "run_extract_card_number": _route_card_number,
+    "task_fetch_data_from_api": _route_fetch_api,
+}
+
+# Filler words any task phrasing may use without changing its meaning
+COMMON_WORDS = set("""
+    a an the of in on to into at from for with and then as by it its is are be
+    this that these those each every all any one per just only file files data
+    write writes written save store put result results output contents content
+    please
+""".split())
+
+# The words each grammar understands. A word outside these (and the values the
+# rule extracted) is a qualifier the plan can't express, e.g. "in 2024",
+# "oldest first" or "with POST", so the task goes to the LLM instead.
+TASK_VOCABULARY: Dict[str, set] = {
+    "run_datagen": set("install uv if required run script python only argument arguments".split()),
+    "run_prettier_format": set("format formatting using prettier updating update in-place place".split()),
+    "run_count_days": set("""
+        contains contain list dates date line lines count counting number numbers
+        how many there days
+    """.split()),
+    "run_sort_array_of_contacts": set("sort sorted array list contacts contact by".split()),
+    "run_write_most_recent_logs": set("""
+        first line lines most recent newest log logs directory folder
+    """.split()),
+    "run_extract_markdown_titles": set("""
+        find markdown md extract first h1 heading headings title titles create
+        index mapping map
+    """.split()),
+    "run_extract_on_email": set("""
+        contains email message pass llm instructions instruction extract sender
+        sender's s address
+    """.split()),
+    "run_extract_card_number": set("""
+        contains credit card number pass image llm have extract without spaces
+    """.split()),
+    "task_fetch_data_from_api": set("fetch download get api json response endpoint url".split()),
+}
+
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9'\-]*")
+
+
+def _unconsumed_words(function_name: str, task: str, args: Dict[str, Any]) -> List[str]:
+    """Words of the task that neither the grammar nor the extracted values account for."""
+    text = task.replace("\u2019", "'")
+    for pattern in (URL_RE, EMAIL_RE, DATA_PATH_RE):
+        text = pattern.sub(" ", text)
+    text = text.lower()
+
+    values = []
+    for value in args.values():
+        values.extend(value if isinstance(value, list) else [value])
+    for value in values:
+        if isinstance(value, (str, int)) and not isinstance(value, bool) and str(value):
+            # Weekdays may appear in the plural, e.g. "Wednesdays"
+            text = re.sub(rf"(?<![\w@]){re.escape(str(value).lower())}s?(?!\w)", " ", text)
+
+    known = COMMON_WORDS | TASK_VOCABULARY.get(function_name, set())
+    return [
+        word for word in WORD_RE.findall(text)
+        if word not in known and word.strip("'-") not in known and word.split("'")[0] not in known
+    ]
+
+
+def classify_task(task_description: str) -> Tuple[Optional[Dict[str, Any]], float]:
+    """
+    Match a task against the rule grammars.
+
+    Returns the `{function_name: args}` plan and a confidence score. A single
+    matching rule that accounts for every word of the task is fully
+    confident; several matching rules are ambiguous, and leftover words mean
+    the task asks for something the plan would silently drop.
+    """
+    task = re.sub(r"\s+", " ", task_description).strip()
+    matches = {}
+    for function_name, rule in TASK_RULES.items():
+        args = rule(task)
+        if args is not None:
+            matches[function_name] = args
+
+    if not matches:
+        return None, 0.0
+    function_name, args = next(iter(matches.items()))
+    confidence = 1.0 / len(matches)
+    if _unconsumed_words(function_name, task, args):
+        confidence *= 0.5
+    return {function_name: args}, confidence
+
+
+def route_task(task_description: str) -> Optional[Dict[str, Any]]:
+    """Return a plan for a known task shape, or None to fall back to the LLM."""
+    plan, confidence = classify_task(task_description)
+    if plan is None or confidence < ROUTER_MIN_CONFIDENCE:
+        router_stats["fallbacks"] += 1
+        return None
+    router_stats["hits"] += 1
+    return plan
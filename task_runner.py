@@ -0,0 +1,97 @@
+import asyncio
+import functools
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+TASK_THREAD_WORKERS = int(os.getenv("TASK_THREAD_WORKERS", "8"))
+TASK_CONCURRENCY = int(os.getenv("TASK_CONCURRENCY", "4"))
+
+# Per task type overrides, e.g. heavy subprocess or scraping handlers
+TASK_CONCURRENCY_LIMITS = {
+    "run_datagen": int(os.getenv("TASK_CONCURRENCY_RUN_DATAGEN", "1")),
+    "run_prettier_format": int(os.getenv("TASK_CONCURRENCY_RUN_PRETTIER_FORMAT", "2")),
+}
+
+_task_thread_pool: Optional[ThreadPoolExecutor] = None
+_task_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def get_task_thread_pool() -> ThreadPoolExecutor:
+    """
+    Return the shared task thread pool, creating it on first use so the app
+    can start again after a lifespan shutdown closed the previous one.
+    """
+    global _task_thread_pool
+    if _task_thread_pool is None:
+        _task_thread_pool = ThreadPoolExecutor(
+            max_workers=TASK_THREAD_WORKERS,
+            thread_name_prefix="task"
+        )
+    return _task_thread_pool
+
+
+def get_task_semaphore(task_name: str) -> asyncio.Semaphore:
+    """Return the semaphore bounding concurrent runs of one task type."""
+    if task_name not in _task_semaphores:
+        limit = TASK_CONCURRENCY_LIMITS.get(task_name, TASK_CONCURRENCY)
+        _task_semaphores[task_name] = asyncio.Semaphore(limit)
+    return _task_semaphores[task_name]
+
+
+async def run_in_thread(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking callable on the shared task thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_task_thread_pool(),
+        functools.partial(func, *args, **kwargs)
+    )
+
+
+async def run_handler(task_name: str, handler: Callable, *args, **kwargs) -> Any:
+    """
+    Run a task handler without blocking the event loop.
+
+    Coroutine handlers are awaited directly; synchronous handlers are sent to
+    the thread pool. Both are bounded by the per-task-type semaphore.
+    """
+    async with get_task_semaphore(task_name):
+        if inspect.iscoroutinefunction(handler):
+            return await handler(*args, **kwargs)
+        return await run_in_thread(handler, *args, **kwargs)
+
+
+async def run_subprocess(*command: str, shell: bool = False) -> Tuple[int, str, str]:
+    """
+    Run a command asynchronously and return (returncode, stdout, stderr).
+
+    Raises FileNotFoundError when the executable does not exist, like subprocess.run.
+    """
+    if shell:
+        process = await asyncio.create_subprocess_shell(
+            command[0],
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    else:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    stdout, stderr = await process.communicate()
+    return (
+        process.returncode,
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace")
+    )
+
+
+def shutdown_task_runner() -> None:
+    """Shut down the task pool; semaphores are dropped since they belong to the old event loop."""
+    global _task_thread_pool
+    if _task_thread_pool is not None:
+        _task_thread_pool.shutdown(wait=False, cancel_futures=True)
+        _task_thread_pool = None
+    _task_semaphores.clear()
@@ -0,0 +1,206 @@
+import http.server
+import json
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+import pytest
+
+import api_pagination
+from api_pagination import iter_pages, request_with_retries
+from http_cache import http_cache
+from task_fetch_data_from_api import task_fetch_data_from_api
+
+RECORDS = [{"id": i} for i in range(23)]
+PAGE_SIZE = 5
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    """Local stand-in API serving RECORDS under every pagination scheme."""
+
+    hits = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=None, headers=None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        StandInHandler.hits[url.path] = StandInHandler.hits.get(url.path, 0) + 1
+
+        if url.path == "/page":
+            page = int(query.get("page", 1))
+            start = (page - 1) * PAGE_SIZE
+            self._send(200, {"data": RECORDS[start:start + PAGE_SIZE]})
+        elif url.path == "/offset":
+            offset, limit = int(query["offset"]), int(query["limit"])
+            self._send(200, RECORDS[offset:offset + limit])
+        elif url.path == "/link":
+            page = int(query.get("page", 1))
+            start = (page - 1) * PAGE_SIZE
+            headers = {}
+            if start + PAGE_SIZE < len(RECORDS):
+                headers["Link"] = f'</link?page={page + 1}>; rel="next"'
+            self._send(200, RECORDS[start:start + PAGE_SIZE], headers)
+        elif url.path == "/cursor":
+            start = int(query.get("cursor", 0))
+            end = start + PAGE_SIZE
+            self._send(200, {
+                "results": RECORDS[start:end],
+                "meta": {"next_cursor": str(end) if end < len(RECORDS) else None}
+            })
+        elif url.path == "/ignores-page":
+            # Returns the same page whatever is asked for
+            self._send(200, RECORDS[:PAGE_SIZE])
+        elif url.path == "/link-cycle":
+            page = int(query.get("page", 1))
+            start = (page - 1) * PAGE_SIZE
+            self._send(200, RECORDS[start:start + PAGE_SIZE], {"Link": f'</link-cycle?page={page % 2 + 1}>; rel="next"'})
+        elif url.path == "/cursor-cycle":
+            self._send(200, {"results": RECORDS[:PAGE_SIZE], "next_cursor": "again"})
+        elif url.path == "/endless":
+            page = int(query.get("page", 1))
+            self._send(200, [{"id": page}])
+        elif url.path == "/flaky":
+            # Fails twice before answering, like an overloaded upstream
+            if StandInHandler.hits[url.path] <= 2:
+                self._send(503, {"error": "busy"}, {"Retry-After": "0"})
+            else:
+                self._send(200, {"ok": True})
+        elif url.path == "/slow-retry":
+            self._send(503, {"error": "busy"}, {"Retry-After": "3600"})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        StandInHandler.hits[self.path] = StandInHandler.hits.get(self.path, 0) + 1
+        self._send(503, {"error": "busy"})
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "directory", str(tmp_path / "http-cache"))
+    StandInHandler.hits = {}
+
+
+@pytest.fixture
+def client():
+    with httpx.Client() as client:
+        yield client
+
+
+def _collect(client, url, pagination):
+    return [item for items in iter_pages(client, "GET", url, {}, {}, pagination) for item in items]
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_page_numbers(server, client, concurrency):
+    pagination = {"type": "page", "page_size": PAGE_SIZE, "concurrency": concurrency}
+    assert _collect(client, f"{server}/page", pagination) == RECORDS
+
+
+def test_offsets(server, client):
+    pagination = {"type": "offset", "page_size": PAGE_SIZE, "concurrency": 3}
+    assert _collect(client, f"{server}/offset", pagination) == RECORDS
+
+
+def test_link_header(server, client):
+    assert _collect(client, f"{server}/link", {"type": "link"}) == RECORDS
+    assert StandInHandler.hits["/link"] == 5
+
+
+def test_cursor(server, client):
+    pagination = {"type": "cursor", "cursor_field": "meta.next_cursor"}
+    assert _collect(client, f"{server}/cursor", pagination) == RECORDS
+
+
+def test_max_pages(server, client):
+    pagination = {"type": "page", "page_size": PAGE_SIZE, "max_pages": 2}
+    assert _collect(client, f"{server}/page", pagination) == RECORDS[:10]
+
+
+def test_repeated_page_stops_pagination(server, client):
+    # No page size, so neither a short page nor an empty one ever arrives
+    assert _collect(client, f"{server}/ignores-page", {"type": "page", "concurrency": 3}) == RECORDS[:PAGE_SIZE]
+
+
+def test_link_cycle_stops(server, client):
+    assert _collect(client, f"{server}/link-cycle?page=1", {"type": "link"}) == RECORDS[:2 * PAGE_SIZE]
+    assert StandInHandler.hits["/link-cycle"] == 2
+
+
+def test_cursor_cycle_stops(server, client):
+    assert _collect(client, f"{server}/cursor-cycle", {"type": "cursor"}) == RECORDS[:PAGE_SIZE] * 2
+    assert StandInHandler.hits["/cursor-cycle"] == 2
+
+
+def test_default_page_cap(server, client, monkeypatch):
+    monkeypatch.setattr(api_pagination, "FETCH_MAX_PAGES", 7)
+    assert _collect(client, f"{server}/endless", {"type": "page", "concurrency": 3}) == [{"id": page} for page in range(1, 8)]
+
+
+def test_flaky_503_is_retried(server, client):
+    response = request_with_retries(client, "GET", f"{server}/flaky", backoff=0)
+    assert response.json() == {"ok": True}
+    assert StandInHandler.hits["/flaky"] == 3
+
+
+def test_retries_give_up(server, client):
+    with pytest.raises(httpx.HTTPStatusError):
+        request_with_retries(client, "GET", f"{server}/flaky", max_retries=1, backoff=0)
+
+
+def test_post_is_not_retried(server, client):
+    with pytest.raises(httpx.HTTPStatusError):
+        request_with_retries(client, "POST", f"{server}/submit", backoff=0)
+    assert StandInHandler.hits["/submit"] == 1
+
+    with pytest.raises(httpx.HTTPStatusError):
+        request_with_retries(client, "POST", f"{server}/submit", max_retries=2, backoff=0, retry_unsafe=True)
+    assert StandInHandler.hits["/submit"] == 4
+
+
+def test_retry_after_is_capped(server, client, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(api_pagination.time, "sleep", sleeps.append)
+    with pytest.raises(httpx.HTTPStatusError):
+        request_with_retries(client, "GET", f"{server}/slow-retry", max_retries=2)
+    assert sleeps == [api_pagination.FETCH_MAX_RETRY_AFTER] * 2
+
+
+@pytest.mark.parametrize("output_format", ["json", "jsonl"])
+def test_task_writes_merged_pages(server, tmp_path, output_format):
+    output = tmp_path / f"records.{output_format}"
+    result = task_fetch_data_from_api(
+        f"{server}/page",
+        output_file_path=str(output),
+        pagination={"type": "page", "page_size": PAGE_SIZE},
+        output_format=output_format
+    )
+    assert result["status"] == "success"
+    assert result["items"] == len(RECORDS) and result["pages"] == 5
+
+    text = output.read_text()
+    if output_format == "json":
+        assert json.loads(text) == RECORDS
+    else:
+        assert [json.loads(line) for line in text.splitlines()] == RECORDS
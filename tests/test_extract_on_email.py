@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+import run_extract_on_email
+from email_batching import is_sender_instruction
+from run_extract_on_email import run_extract_on_email as extract
+
+MAILBOX = (
+    "From: alice@example.com\nSubject: one\n\nHi\n\n"
+    "From: bob@example.com\nSubject: two\n\nHello\n\n"
+    "From: alice@example.com\nSubject: three\n\nAgain\n"
+)
+
+
+@pytest.mark.parametrize("instruction", [
+    "extract sender emails",
+    "sender's email address",
+    "Extract the sender's email address from the email.",
+    "find the email address of the sender",
+])
+def test_plain_sender_instructions(instruction):
+    assert is_sender_instruction(instruction)
+
+
+@pytest.mark.parametrize("instruction", [
+    "extract the sender email and write it in uppercase",
+    "extract sender emails from domain example.com",
+    "extract the recipient's email",
+    "extract sender name",
+    "count the senders",
+])
+def test_other_instructions_need_the_llm(instruction):
+    assert not is_sender_instruction(instruction)
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    prompts = []
+
+    async def call_llm(headers, process_instruction, email_text, num_messages=1):
+        prompts.append(process_instruction)
+        return "ALICE@EXAMPLE.COM\nBOB@EXAMPLE.COM\nALICE@EXAMPLE.COM"
+
+    monkeypatch.setenv("AIPROXY_TOKEN", "token")
+    monkeypatch.setattr(run_extract_on_email, "_call_llm", call_llm)
+    return prompts
+
+
+def test_sender_addresses_come_from_headers(tmp_path, llm):
+    (tmp_path / "email.txt").write_text(MAILBOX)
+    output = tmp_path / "senders.txt"
+    result = asyncio.run(extract(str(tmp_path / "email.txt"), str(output), "extract sender emails"))
+    assert result["llm_calls"] == 0 and llm == []
+    assert output.read_text() == "alice@example.com\nbob@example.com"
+
+
+def test_other_instructions_are_written_verbatim(tmp_path, llm):
+    (tmp_path / "email.txt").write_text(MAILBOX)
+    output = tmp_path / "senders.txt"
+    instruction = "extract the sender email and write it in uppercase"
+    result = asyncio.run(extract(str(tmp_path / "email.txt"), str(output), instruction))
+    assert result["llm_calls"] == 1 and llm == [instruction]
+    assert output.read_text() == "ALICE@EXAMPLE.COM\nBOB@EXAMPLE.COM\nALICE@EXAMPLE.COM"
@@ -0,0 +1,40 @@
+import json
+import random
+
+import pytest
+
+from task_fetch_data_from_api import _pretty_print_json_file
+
+
+@pytest.mark.parametrize("leading", ["", "\n" * 2000])
+def test_pretty_print_large_numeric_array(tmp_path, leading):
+    rng = random.Random(0)
+    values = [rng.uniform(-1e3, 1e3) for _ in range(100_000)] + [1e-7, -2.5e12, 3]
+    source = tmp_path / "download.json"
+    source.write_text(leading + json.dumps(values, separators=(",", ":")))
+    output = tmp_path / "pretty.json"
+
+    assert _pretty_print_json_file(str(source), str(output)) == len(values)
+    assert output.read_text() == json.dumps(values, indent=2)
+
+
+def test_pretty_print_object(tmp_path):
+    source = tmp_path / "download.json"
+    source.write_text('{"a": [1.5, 2], "b": "x"}')
+    output = tmp_path / "pretty.json"
+
+    _pretty_print_json_file(str(source), str(output))
+    assert json.loads(output.read_text()) == {"a": [1.5, 2], "b": "x"}
+
+
+@pytest.mark.parametrize("document", ['[1, 2, {"broken": ', '{"broken": '])
+def test_invalid_json_keeps_existing_output(tmp_path, document):
+    source = tmp_path / "download.json"
+    source.write_text(document)
+    output = tmp_path / "pretty.json"
+    output.write_text("previous")
+
+    with pytest.raises(ValueError):
+        _pretty_print_json_file(str(source), str(output))
+    assert output.read_text() == "previous"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["download.json", "pretty.json"]
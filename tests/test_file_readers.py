@@ -0,0 +1,33 @@
+
+import asyncio
+
+import pytest
+
+from file_readers import head_lines, read_files, shutdown_file_readers, tail_lines
+
+
+@pytest.mark.parametrize("ending", ["", "unterminated é"])
+@pytest.mark.parametrize("num_lines", [1, 2, 5, 20, 25])
+def test_tail_lines_multibyte(tmp_path, ending, num_lines):
+    # 6000-byte lines so block boundaries land inside two-byte characters
+    text = "".join("é" * (3000 + i) + "\n" for i in range(20)) + ending
+    path = tmp_path / "app.log"
+    path.write_text(text, encoding="utf-8")
+
+    expected = text.splitlines(keepends=True)[-num_lines:]
+    assert tail_lines(str(path), num_lines) == expected
+
+
+def test_head_lines(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("a\nb\nc\n")
+    assert head_lines(str(path), 2) == ["a\n", "b\n"]
+    assert tail_lines(str(path), 0) == []
+
+
+def test_read_files_works_again_after_shutdown(tmp_path):
+    path = tmp_path / "a.log"
+    path.write_text("one\ntwo\n")
+    for _ in range(2):
+        assert asyncio.run(read_files(head_lines, [str(path), str(tmp_path / "missing")], 1))[0] == ["one\n"]
+        shutdown_file_readers()
@@ -0,0 +1,27 @@
+import pytest
+
+import html_extractors
+from html_extractors import available_backends, make_extractor
+
+PAGE = (
+    '<html><body><h1> Title </h1><p class="summary">One <b>two</b></p>'
+    '<ul><li><a href="/a">A</a></li><li><a href="b.html">B</a></li></ul></body></html>'
+)
+
+
+def test_default_backend_is_bs4():
+    assert html_extractors.HTML_PARSER_BACKEND == "bs4"
+    assert available_backends()[0] == "bs4"
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_agree_on_well_formed_html(backend):
+    selectors = ["h1", "p.summary", "ul li a"]
+    expected = make_extractor(selectors, "bs4")(PAGE, "http://example.com/dir/")
+    assert make_extractor(selectors, backend)(PAGE, "http://example.com/dir/") == expected
+    assert expected[0]["p.summary"] == ["One two"]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        make_extractor(["h1"], "auto")
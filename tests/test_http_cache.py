@@ -0,0 +1,52 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from http_cache import HTTPCache, cache_stats
+
+
+def _transport(responses, seen):
+    def handler(request):
+        seen.append(dict(request.headers))
+        status, headers = responses[min(len(seen), len(responses)) - 1]
+        return httpx.Response(status, headers=headers, content=b"body" if status == 200 else b"")
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache_stats.update({name: 0 for name in cache_stats})
+    return HTTPCache(str(tmp_path / "http-cache"))
+
+
+def test_fresh_entry_is_reused(cache):
+    seen = []
+    with httpx.Client(transport=_transport([(200, {"Cache-Control": "max-age=60"})], seen)) as client:
+        for _ in range(2):
+            assert cache.request(client, "GET", "https://example.com/a").content == b"body"
+    assert len(seen) == 1 and cache_stats["hits"] == 1
+
+
+def test_unreusable_response_is_not_stored(cache):
+    seen = []
+    with httpx.Client(transport=_transport([(200, {})], seen)) as client:
+        for _ in range(2):
+            cache.request(client, "GET", "https://example.com/a")
+    assert len(seen) == 2
+    assert not os.path.exists(cache.directory)
+
+
+def test_async_revalidation(cache):
+    seen = []
+    transport = _transport([(200, {"ETag": '"v1"'}), (304, {"ETag": '"v1"'})], seen)
+
+    async def fetch_twice():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return [await cache.arequest(client, "GET", "https://example.com/a") for _ in range(2)]
+
+    first, second = asyncio.run(fetch_twice())
+    assert first.content == second.content == b"body"
+    assert seen[1]["if-none-match"] == '"v1"'
+    assert cache_stats["revalidated"] == 1
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from job_queue import JobQueue, JobQueueFull
+
+
+def test_jobs_run_and_wait_returns_the_result():
+    async def execute(task):
+        if task == "bad":
+            raise ValueError("no plan")
+        return {"status": "success", "task": task}
+
+    async def scenario():
+        queue = JobQueue(execute, max_size=4, workers=2)
+        good, bad = queue.submit("good"), queue.submit("bad")
+        assert good["status"] == "queued"
+        assert (await queue.wait(good["id"], 1))["result"] == {"status": "success", "task": "good"}
+        assert (await queue.wait(bad["id"], 1))["error"] == "no plan"
+        assert queue.stats()["succeeded"] == 1 and queue.stats()["failed"] == 1
+        await queue.stop()
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_rejects_submissions():
+    async def scenario():
+        queue = JobQueue(asyncio.Event().wait, max_size=1, workers=1)
+        queue.submit("first")
+        await asyncio.sleep(0)  # the worker takes the first job
+        queue.submit("second")
+        with pytest.raises(JobQueueFull):
+            queue.submit("third")
+        await queue.stop()
+
+    asyncio.run(scenario())
+
+
+def test_stop_fails_leftover_jobs_and_restart_begins_empty():
+    async def scenario():
+        queue = JobQueue(asyncio.Event().wait, max_size=4, workers=1)
+        running, queued = queue.submit("running"), queue.submit("queued")
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(queue.wait(queued["id"], 5))
+        await asyncio.sleep(0)
+        await queue.stop()
+        assert (await waiter)["status"] == "failed"
+        assert running["status"] == queued["status"] == "failed"
+        assert running["finished_at"] is not None
+
+        queue.execute = lambda task: asyncio.sleep(0, result=task)
+        job = queue.submit("again")
+        assert (await queue.wait(job["id"], 1))["result"] == "again"
+        await queue.stop()
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def app_queue(monkeypatch):
+
+    async def execute(task):
+        if task == "slow":
+            await asyncio.sleep(5)
+        return {"status": "success", "task": task}
+
+    queue = JobQueue(execute, max_size=1, workers=1)
+    monkeypatch.setattr(main, "job_queue", queue)
+    with TestClient(main.app) as client:
+        yield client
+
+
+def test_run_async_answers_inline_with_wait(app_queue):
+    response = app_queue.post("/run", params={"task": "quick", "mode": "async", "wait": 1})
+    assert response.status_code == 200
+    assert response.json() == {"status": "success", "task": "quick"}
+
+
+def test_run_async_backpressure(app_queue):
+    first = app_queue.post("/run", params={"task": "slow", "mode": "async"})
+    assert first.status_code == 202
+    job_url = first.json()["url"]
+    assert app_queue.get(job_url).json()["status"] in ("queued", "running")
+
+    # One job running and one waiting fill the single-slot queue
+    assert app_queue.post("/run", params={"task": "slow", "mode": "async"}).status_code == 202
+    rejected = app_queue.post("/run", params={"task": "slow", "mode": "async"})
+    assert rejected.status_code == 429
+    assert rejected.headers["Retry-After"] == "5"
@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+import pytest
+
+import json_backend
+from json_backend import dump_json, dumps_json, load_json, loads_json
+from run_sort_array_of_contacts import run_sort_array_of_contacts
+
+SAMPLE = [
+    {"first_name": "José", "last_name": "Ñúñez", "score": 1e-07, "big": 1e16},
+    {"first_name": "Zoë", "last_name": "Ødegaard", "score": 2.5, "tags": []},
+    {"first_name": "Ana", "last_name": "Smith", "score": -3, "extra": {}, "id": 2 ** 70},
+]
+
+
+def test_pretty_output_matches_json_dump(tmp_path):
+    path = tmp_path / "out.json"
+    dump_json(SAMPLE, str(path))
+    assert path.read_bytes() == json.dumps(SAMPLE, indent=2).encode()
+    assert dumps_json(SAMPLE, pretty=True) == json.dumps(SAMPLE, indent=2).encode()
+    assert load_json(str(path)) == SAMPLE
+
+
+def test_compact_output_round_trips():
+    assert json.loads(dumps_json(SAMPLE, pretty=False)) == SAMPLE
+
+
+def test_sort_paths_write_identical_bytes(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "app").mkdir()
+    contacts = SAMPLE * 50
+    (tmp_path / "data" / "contacts.json").write_text(json.dumps(contacts))
+    # Handlers resolve paths relative to the parent of the working directory
+    monkeypatch.chdir(tmp_path / "app")
+
+    for budget in (100, 0.001):
+        result = asyncio.run(run_sort_array_of_contacts(
+            "data/contacts.json", f"data/sorted-{budget}.json", ["last_name", "first_name"], budget
+        ))
+        assert result["status"] == "success"
+
+    in_memory = (tmp_path / "data" / "sorted-100.json").read_bytes()
+    external = (tmp_path / "data" / "sorted-0.001.json").read_bytes()
+    assert in_memory == external
+    expected = sorted(contacts, key=lambda c: (c["last_name"], c["first_name"]))
+    assert in_memory == json.dumps(expected, indent=2).encode()
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "orjson"])
+def test_loads_json_matches_stdlib(monkeypatch, backend):
+    monkeypatch.setattr(json_backend, "JSON_BACKEND", backend)
+    text = '[18446744073709551616, -9223372036854775809, NaN, -Infinity, 1e400, {"a": 1.5}]'
+    parsed = loads_json(text)
+    expected = json.loads(text)
+    assert json.dumps(parsed) == json.dumps(expected)
+    assert parsed[0] == 18446744073709551616 and isinstance(parsed[1], int)
@@ -0,0 +1,65 @@
+import io
+import json
+import random
+
+import pytest
+
+from json_stream import iter_json_array, write_json_array
+from output_sinks import open_sink
+
+
+def _read(text, chunk_size):
+    return list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 5, 7, 16])
+def test_numbers_split_across_chunks(chunk_size):
+    text = '[1.25, 3, -0.5, 1e-3, 2E+10, -7, 0, 12.5e2, true, null, "x"]'
+    assert _read(text, chunk_size) == json.loads(text)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 1000])
+def test_number_heavy_array(chunk_size):
+    rng = random.Random(chunk_size)
+    values = [rng.uniform(-1e6, 1e6) for _ in range(2000)]
+    values += [rng.randint(-10**9, 10**9) for _ in range(2000)]
+    values += [rng.uniform(-1, 1) * 10 ** rng.randint(-30, 30) for _ in range(2000)]
+    text = json.dumps(values)
+    assert _read(text, chunk_size) == values
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64])
+def test_objects_and_whitespace(chunk_size):
+    items = [{"first_name": "Ana", "scores": [1.5, 2]}, [], {}, "a,b]", 4.0]
+    assert _read(json.dumps(items, indent=2), chunk_size) == items
+
+
+def test_empty_array_and_non_array():
+    assert _read(" [ ] ", 1) == []
+    with pytest.raises(ValueError):
+        _read('{"a": 1}', 4)
+
+
+def test_truncated_array_raises():
+    with pytest.raises(json.JSONDecodeError):
+        _read("[1.5, 2", 2)
+
+
+def test_write_json_array_matches_json_dump():
+    items = [{"name": "José", "n": [1, 2.5]}, "x", None]
+    out = io.StringIO()
+    assert write_json_array(out, iter(items)) == 3
+    assert out.getvalue() == json.dumps(items, indent=2)
+
+    out = io.StringIO()
+    write_json_array(out, [])
+    assert out.getvalue() == json.dumps([], indent=2)
+
+
+@pytest.mark.parametrize("items", [[], [{"a": [1, {"b": "é"}]}, 2.5, None, []]])
+def test_json_sink_matches_write_json_array(tmp_path, items):
+    path = tmp_path / "records.json"
+    with open_sink(str(path), "json", flush_rows=1) as sink:
+        for item in items:
+            sink.write(item)
+    assert path.read_text() == json.dumps(items, indent=2)
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    calls = []
+
+    async def run_count_days(input_file_path, weekday_to_count, output_file_path=None):
+        calls.append({
+            "input_file_path": input_file_path,
+            "weekday_to_count": weekday_to_count,
+            "output_file_path": output_file_path
+        })
+        return {"status": "success", "output_file": output_file_path}
+
+    monkeypatch.setattr(main, "run_count_days", run_count_days)
+    return calls
+
+
+def test_call_task_binds_arguments_by_name(recorded):
+    plan = {"run_count_days": {
+        "output_file_path": "/data/out.txt",
+        "weekday_to_count": "Wednesday",
+        "input_file_path": "/data/dates.txt"
+    }}
+    asyncio.run(main.call_task(plan))
+    assert recorded == [{
+        "input_file_path": "/data/dates.txt",
+        "weekday_to_count": "Wednesday",
+        "output_file_path": "/data/out.txt"
+    }]
+
+
+@pytest.mark.parametrize("plan", [
+    {"run_count_days": {"input_file_path": "/data/dates.txt", "weekday_to_count": "Monday", "year": 2024}},
+    {"run_count_days": {"weekday_to_count": "Monday"}},
+    {"run_unknown": {}},
+])
+def test_call_task_rejects_bad_plans(recorded, plan):
+    with pytest.raises(ValueError):
+        asyncio.run(main.call_task(plan))
+    assert recorded == []
+
+
+def test_multi_step_plan_binds_step_arguments_by_name(recorded):
+    plan = {"run_multi_step_plan": {"steps": [
+        {"id": "count", "function": "run_count_days", "arguments": {
+            "output_file_path": "/data/out.txt",
+            "input_file_path": "/data/dates.txt",
+            "weekday_to_count": "Friday"
+        }},
+        {"id": "bad", "function": "run_count_days", "arguments": {"input": "/data/out.txt"}},
+    ]}}
+    result = asyncio.run(main.call_task(plan))
+    assert recorded[0]["input_file_path"] == "/data/dates.txt"
+    assert result["steps"]["count"]["status"] == "success"
+    assert result["steps"]["bad"]["status"] == "error"
+    assert "Invalid arguments" in result["steps"]["bad"]["message"]
+
+
+def test_batch_runs_tasks_sharing_files_in_submission_order(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    plans = {
+        "generate": {"run_datagen": {"email": "user@example.com"}},
+        "count": {"run_count_days": {"input_file_path": "/data/dates.txt", "weekday_to_count": "Wednesday"}},
+        "fetch": {"task_fetch_data_from_api": {"api_url": "https://example.com", "output_file_path": "/tmp/out.json"}},
+    }
+    events = []
+
+    async def get_plan(task):
+        return plans[task]
+
+    async def call_task(plan):
+        function = next(iter(plan))
+        events.append(("start", function))
+        await asyncio.sleep(0.05)
+        events.append(("end", function))
+        return {"status": "success"}
+
+    monkeypatch.setattr(main, "get_plan", get_plan)
+    monkeypatch.setattr(main, "call_task", call_task)
+    with TestClient(main.app) as client:
+        response = client.post("/run/batch", json=["generate", "count", "fetch"])
+    lines = [line for line in response.text.splitlines() if line]
+    assert len(lines) == 3
+
+    # count reads what datagen writes into /data; fetch touches neither and overlaps datagen
+    assert events.index(("end", "run_datagen")) < events.index(("start", "run_count_days"))
+    assert events.index(("start", "task_fetch_data_from_api")) < events.index(("end", "run_datagen"))
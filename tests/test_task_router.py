@@ -0,0 +1,116 @@
+import pytest
+
+from task_router import classify_task, route_task
+
+DATAGEN_URL = "https://raw.githubusercontent.com/sanand0/tools-in-data-science-public/tds-2025-01/project-1/datagen.py"
+
+# The A1-A8 task templates and the plans they must route to without the LLM
+TEMPLATES = [
+    (
+        f"Install uv (if required) and run {DATAGEN_URL} with 23f3004114@ds.study.iitm.ac.in as the only argument.",
+        {"run_datagen": {
+            "command_to_run": "uv run",
+            "file_url": DATAGEN_URL,
+            "argument_to_pass": "23f3004114@ds.study.iitm.ac.in",
+            "is_url_remote": "true",
+            "is_remote_safe": "true"
+        }}
+    ),
+    (
+        "Format the contents of /data/format.md using prettier@3.4.2, updating the file in-place",
+        {"run_prettier_format": {
+            "file_path": "/data/format.md",
+            "command_to_run": "prettier@3.4.2",
+            "is_prettier": "true",
+            "prettier_version": "3.4.2"
+        }}
+    ),
+    (
+        "The file /data/dates.txt contains a list of dates, one per line. Count the number of Wednesdays "
+        "in the list, and write just the number to /data/dates-wednesdays.txt",
+        {"run_count_days": {
+            "input_file_path": "/data/dates.txt",
+            "weekday_to_count": "Wednesday",
+            "output_file_path": "/data/dates-wednesdays.txt"
+        }}
+    ),
+    (
+        "Sort the array of contacts in /data/contacts.json by last_name, then first_name, "
+        "and write the result to /data/contacts-sorted.json",
+        {"run_sort_array_of_contacts": {
+            "input_file_path": "/data/contacts.json",
+            "output_file_path": "/data/contacts-sorted.json",
+            "sort_attributes": ["last_name", "first_name"]
+        }}
+    ),
+    (
+        "Write the first line of the 10 most recent .log file in /data/logs/ to /data/logs-recent.txt, "
+        "most recent first",
+        {"run_write_most_recent_logs": {
+            "input_directory": "/data/logs/",
+            "file_pattern": "*.log",
+            "output_file_path": "/data/logs-recent.txt",
+            "num_files": 10,
+            "lines_per_file": 1
+        }}
+    ),
+    (
+        "Find all Markdown (.md) files in /data/docs/. Extract the first H1 heading from each file "
+        "and create an index file at /data/docs/index.json",
+        {"run_extract_markdown_titles": {
+            "input_directory": "/data/docs/",
+            "output_file_path": "/data/docs/index.json",
+            "file_pattern": "*.md",
+            "tag_pattern": "#"
+        }}
+    ),
+    (
+        "/data/email.txt contains an email message. Pass the content to an LLM with instructions to "
+        "extract the sender’s email address, and write just the email address to /data/email-sender.txt",
+        {"run_extract_on_email": {
+            "input_file_path": "/data/email.txt",
+            "output_file_path": "/data/email-sender.txt",
+            "process_instruction": "extract the sender’s email address"
+        }}
+    ),
+    (
+        "/data/credit_card.png contains a credit card number. Pass the image to an LLM, have it extract "
+        "the card number, and write it without spaces to /data/credit-card.txt",
+        {"run_extract_card_number": {
+            "input_image_path": "/data/credit_card.png",
+            "output_file_path": "/data/credit-card.txt",
+            "process_instruction": "extract card number without spaces"
+        }}
+    ),
+]
+
+
+@pytest.mark.parametrize("task, plan", TEMPLATES)
+def test_templates_route_without_llm(task, plan):
+    assert classify_task(task) == (plan, 1.0)
+    assert route_task(task) == plan
+
+
+@pytest.mark.parametrize("task", [
+    "The file /data/dates.txt contains a list of dates, one per line. Count the Sundays in the list "
+    "and write just the number to /data/dates-sundays.txt",
+    "Sort the array of contacts in /data/people.json by email and write the result to /data/people-sorted.json",
+    "Fetch data from the API at https://api.example.com/users and save it to /data/users.json",
+])
+def test_variants_still_route(task):
+    assert route_task(task) is not None
+
+
+@pytest.mark.parametrize("task", [
+    "The file /data/dates.txt contains a list of dates, one per line. Count the Wednesdays in /data/dates.txt "
+    "that fall in 2024, and write just the number to /data/dates-wednesdays.txt",
+    "Write the first line of the 10 most recent .log file in /data/logs/ to /data/logs-recent.txt, oldest first",
+    "Fetch data from the API at https://api.example.com/users with POST and save it to /data/users.json",
+    "/data/email.txt contains an email message. Pass the content to an LLM with instructions to extract "
+    "the sender's email address, and write only the domain to /data/email-domain.txt",
+    "Sort the array of contacts in /data/contacts.json by last_name, then first_name, descending, "
+    "and write the result to /data/contacts-sorted.json",
+    "Format the contents of /data/format.md using prettier@3.4.2 with tabs, updating the file in-place",
+])
+def test_near_misses_fall_back_to_llm(task):
+    assert route_task(task) is None
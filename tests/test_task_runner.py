@@ -0,0 +1,11 @@
+import asyncio
+
+from task_runner import run_handler, run_in_thread, shutdown_task_runner
+
+
+def test_runner_works_again_after_shutdown():
+    # Each app startup gets a fresh event loop and, after shutdown, a fresh pool
+    for _ in range(2):
+        assert asyncio.run(run_in_thread(sum, [1, 2, 3])) == 6
+        assert asyncio.run(run_handler("run_datagen", max, 1, 2)) == 2
+        shutdown_task_runner()
@@ -0,0 +1,118 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urldefrag, urlsplit, urlunsplit
+
+import httpx
+
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "8"))
+CRAWL_HOST_RATE = float(os.getenv("CRAWL_HOST_RATE", "5"))
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used to deduplicate pages: no fragment, lowercase host, default port dropped."""
+    url, _ = urldefrag(url)
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+def same_origin(url: str, other: str) -> bool:
+    a, b = urlsplit(url), urlsplit(other)
+    return (a.scheme, a.netloc) == (b.scheme, b.netloc)
+
+
+class HostRateLimiter:
+    """Spaces out requests to the same host to at most `rate` per second."""
+
+    def __init__(self, rate: float = CRAWL_HOST_RATE):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+
+    async def wait(self, url: str) -> None:
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+        # Reserve the next slot before sleeping so concurrent callers queue up
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def crawl(
+    start_url: str,
+    max_depth: int,
+    fetch: Callable[[str], Awaitable[httpx.Response]],
+    process_page: Callable[[str, httpx.Response], Awaitable[Tuple[Any, List[str]]]],
+    on_result: Callable[[str, int, Any], None],
+    concurrency: int = CRAWL_CONCURRENCY,
+    host_rate: float = CRAWL_HOST_RATE
+) -> Dict[str, int]:
+    """
+    Breadth-first crawl of same-origin links from `start_url`.
+
+    The start page is depth 1 and links are followed until `max_depth`. Each
+    level is fetched concurrently under a global cap and a per-host rate
+    limit. `process_page(url, response)` returns (result, links) and
+    `on_result(url, depth, result)` is called as soon as each page finishes,
+    so callers can stream results out instead of collecting them.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    limiter = HostRateLimiter(host_rate)
+    seen = {normalize_url(start_url)}
+    frontier = [start_url]
+    stats = {"pages": 0, "errors": 0}
+
+    async def visit(url: str, depth: int) -> List[str]:
+        async with semaphore:
+            await limiter.wait(url)
+            response = await fetch(url)
+        result, links = await process_page(url, response)
+        on_result(url, depth, result)
+        stats["pages"] += 1
+        return links
+
+    for depth in range(1, max(1, max_depth) + 1):
+        if not frontier:
+            break
+        outcomes = await asyncio.gather(
+            *(visit(url, depth) for url in frontier),
+            return_exceptions=True
+        )
+        if depth == 1 and isinstance(outcomes[0], Exception):
+            # Nothing was crawled at all, so surface the start page failure
+            raise outcomes[0]
+
+        next_frontier = []
+        for links in outcomes:
+            if isinstance(links, Exception):
+                stats["errors"] += 1
+                continue
+            for link in links:
+                normalized = normalize_url(link)
+                if normalized not in seen and same_origin(link, start_url):
+                    seen.add(normalized)
+                    next_frontier.append(link)
+        frontier = next_frontier
+
+    return stats
+
+
+def extract_links(base_url: str, hrefs: List[Optional[str]]) -> List[str]:
+    """Resolve hrefs against the page URL, keeping only http(s) links without fragments."""
+    links = []
+    for href in hrefs:
+        if not href:
+            continue
+        link, _ = urldefrag(urljoin(base_url, href.strip()))
+        if urlsplit(link).scheme in ("http", "https"):
+            links.append(link)
+    return links
@@ -0,0 +1,52 @@
+import json
+import os
+from typing import Dict, List, Tuple
+
+from date_parsing import count_weekdays_in_file
+
+# In-memory copy of the sidecar histograms, keyed by absolute input path
+_weekday_index: Dict[str, Dict] = {}
+
+
+def _sidecar_path(file_path: str) -> str:
+    directory, name = os.path.split(file_path)
+    return os.path.join(directory, f".{name}.weekdays.json")
+
+
+def _file_signature(file_path: str) -> Tuple[int, int]:
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_weekday_counts(file_path: str) -> Tuple[List[int], bool]:
+    """
+    Return the weekday histogram (Monday first) for a dates file and whether
+    it came from the cache.
+
+    Histograms are keyed on path + mtime + size and persisted in a hidden
+    sidecar next to the file, so only new or changed files are reparsed.
+    """
+    file_path = os.path.abspath(file_path)
+    mtime_ns, size = _file_signature(file_path)
+
+    entry = _weekday_index.get(file_path)
+    if entry is None:
+        try:
+            with open(_sidecar_path(file_path), 'r') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            entry = None
+    if entry and entry["mtime_ns"] == mtime_ns and entry["size"] == size:
+        _weekday_index[file_path] = entry
+        return entry["counts"], True
+
+    counts = count_weekdays_in_file(file_path)
+    entry = {"mtime_ns": mtime_ns, "size": size, "counts": counts}
+    _weekday_index[file_path] = entry
+    try:
+        with open(_sidecar_path(file_path), 'w') as f:
+            json.dump(entry, f)
+    except OSError as e:
+        # A read-only data directory only costs us the persisted copy
+        print(f"Could not write weekday index for {file_path}: {e}")
+    return counts, False